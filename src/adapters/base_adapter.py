@@ -109,6 +109,37 @@ class BaseAdapter(ABC):
         """
         pass
     
+    def set_breakpoints(self, addresses: List[int], bp_type: BreakpointType) -> AdapterResult:
+        """
+        Set breakpoints at several addresses in one call
+        
+        ADR Note: Default implementation calls set_breakpoint per address.
+        Adapters whose tool can take the whole batch in one RPC or script
+        should override this to avoid a round-trip per breakpoint.
+        
+        Args:
+            addresses: Memory addresses
+            bp_type: Type of breakpoint
+        
+        Returns:
+            AdapterResult with per-address breakpoint results
+        """
+        breakpoints = []
+        for address in addresses:
+            result = self.set_breakpoint(address, bp_type)
+            breakpoints.append({
+                "address": f"0x{address:X}",
+                "success": result.success,
+                "error": result.error
+            })
+        
+        failed = [bp for bp in breakpoints if not bp["success"]]
+        return AdapterResult(
+            success=not failed,
+            data={"breakpoints": breakpoints, "count": len(breakpoints)},
+            error=failed[0]["error"] if failed else None
+        )
+    
     @abstractmethod
     def read_memory(self, address: int, size: int) -> AdapterResult:
         """
@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 
 from .base_adapter import BaseAdapter, AdapterResult, BreakpointType
-from ..utils.ida_rpc_client import IDAProRPCClient
+from ..utils.ida_rpc_client import IDAProRPCClient, format_address
 from ..tool_detection import ToolType
 
 logger = logging.getLogger(__name__)
@@ -88,6 +88,7 @@ class IDAAdapter(BaseAdapter):
     
     def disconnect(self) -> AdapterResult:
         """Disconnect from IDA Pro"""
+        self.rpc_client.close()
         self.is_connected = False
         self.current_database = None
         return AdapterResult(success=True, data={"message": "Disconnected"})
@@ -137,7 +138,7 @@ class IDAAdapter(BaseAdapter):
         """
         try:
             # IDA Pro RPC expects address as hex string
-            addr_str = f"0x{address:X}"
+            addr_str = format_address(address)
             code = self.rpc_client._call_rpc("decompile_function", [addr_str])
             if isinstance(code, str):
                 return AdapterResult(
@@ -6,11 +6,15 @@ Messages are structured JSON objects with type, payload, and metadata.
 This allows components to communicate reliably over TCP sockets.
 """
 
+import array
+import base64
 import json
 import logging
+import struct
+import sys
 from dataclasses import dataclass, asdict
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -173,6 +177,52 @@ class MessageCodec:
             source=source
         )
     
+    @staticmethod
+    def encode_scan_result(addresses: Iterable[int]) -> bytes:
+        """
+        Encode scan addresses as a binary frame
+        
+        ADR Note: Frame is a little-endian uint32 count followed by raw
+        uint64 addresses. Roughly 2.5x smaller than a JSON list of hex
+        strings and decoded with a single frombytes() call. array uses
+        native byte order, so big-endian hosts byteswap on both ends.
+        """
+        packed = array.array('Q', addresses)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return struct.pack("<I", len(packed)) + packed.tobytes()
+    
+    @staticmethod
+    def decode_scan_result(data: bytes) -> array.array:
+        """Decode a binary frame produced by encode_scan_result"""
+        (count,) = struct.unpack_from("<I", data)
+        addresses = array.array('Q')
+        addresses.frombytes(data[4:4 + 8 * count])
+        if sys.byteorder == "big":
+            addresses.byteswap()
+        return addresses
+    
+    @staticmethod
+    def create_packed_scan_result(
+        addresses: Iterable[int],
+        source: str = "memory_scanner"
+    ) -> Message:
+        """
+        Create a scan result message carrying a binary address frame
+        
+        ADR Note: The transport is newline-delimited JSON, so the frame is
+        base64-encoded under "addresses_packed" rather than sent raw.
+        """
+        frame = MessageCodec.encode_scan_result(addresses)
+        return Message(
+            message_type=MessageType.SCAN_RESULT,
+            payload={
+                "addresses_packed": base64.b64encode(frame).decode('ascii'),
+                "count": struct.unpack_from("<I", frame)[0]
+            },
+            source=source
+        )
+    
     @staticmethod
     def create_error(
         error: str,
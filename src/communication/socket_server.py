@@ -10,7 +10,7 @@ import socket
 import threading
 import logging
 from typing import Callable, Optional, Dict
-from queue import Queue
+from queue import Queue, SimpleQueue
 
 from .message_protocol import Message, MessageCodec
 
@@ -23,7 +23,8 @@ class ComponentServer:
     
     ADR Note: Listens for incoming connections and messages from other components.
     Messages are handled by registered callback functions. Supports multiple
-    concurrent connections.
+    concurrent connections. Components living in the same process can post
+    messages through send_local(), which skips JSON encoding and TCP entirely.
     """
     
     def __init__(self, host: str = "127.0.0.1", port: int = 0):
@@ -42,6 +43,12 @@ class ComponentServer:
         self.message_handlers: Dict[str, Callable[[Message], None]] = {}
         self.connections: list[socket.socket] = []
         self.message_queue = Queue()
+        
+        # In-process fast path
+        self.local_handlers: Dict[str, Callable[[Message], None]] = {}
+        self.local_queue: SimpleQueue = SimpleQueue()
+        self.local_thread: Optional[threading.Thread] = None
+        self._local_lock = threading.Lock()
     
     def register_handler(self, message_type: str, handler: Callable[[Message], None]):
         """
@@ -54,6 +61,60 @@ class ComponentServer:
         self.message_handlers[message_type] = handler
         logger.debug(f"Registered handler for {message_type}")
     
+    def register_local_handler(self, message_type: str, handler: Callable[[Message], None]):
+        """
+        Register a handler for messages posted in-process via send_local()
+        
+        Args:
+            message_type: Type of message to handle
+            handler: Callback function to call with the Message object
+        """
+        self.local_handlers[message_type] = handler
+        logger.debug(f"Registered local handler for {message_type}")
+    
+    def send_local(self, message: Message) -> bool:
+        """
+        Deliver a message from a component in the same process
+        
+        ADR Note: The Message object is queued as-is and dispatched on a
+        dedicated worker thread, so no JSON round-trip happens. Cross-process
+        components keep using ComponentClient over TCP.
+        
+        Args:
+            message: Message to deliver
+        
+        Returns:
+            True if a local handler accepted the message, False if the caller
+            should fall back to TCP
+        """
+        if message.message_type.value not in self.local_handlers:
+            return False
+        
+        with self._local_lock:
+            if self.local_thread is None or not self.local_thread.is_alive():
+                self.local_thread = threading.Thread(
+                    target=self._process_local_messages,
+                    daemon=True
+                )
+                self.local_thread.start()
+        
+        self.local_queue.put(message)
+        return True
+    
+    def _process_local_messages(self):
+        """Dispatch in-process messages to local handlers"""
+        while True:
+            message = self.local_queue.get()
+            if message is None:
+                break
+            
+            handler = self.local_handlers.get(message.message_type.value)
+            if handler:
+                try:
+                    handler(message)
+                except Exception as e:
+                    logger.error(f"Error in local message handler: {e}")
+    
     def start(self) -> int:
         """
         Start the server
@@ -98,6 +159,13 @@ class ComponentServer:
                 pass
         
         self.connections.clear()
+        
+        # Stop local dispatch worker
+        with self._local_lock:
+            if self.local_thread is not None:
+                self.local_queue.put(None)
+                self.local_thread = None
+        
         logger.info("Component server stopped")
     
     def _accept_connections(self):
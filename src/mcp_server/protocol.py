@@ -265,6 +265,12 @@ class MCPProtocolHandler:
                             "process_id": {
                                 "type": "integer",
                                 "description": "Process ID (PID) - alternative to process_name"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["png", "jpeg"],
+                                "description": "Image encoding (jpeg is faster and smaller for large windows)",
+                                "default": "png"
                             }
                         }
                     }
@@ -432,14 +438,19 @@ class MCPProtocolHandler:
             else:
                 raise ValueError(f"Unknown resource: {uri}")
     
-    async def _initialize_adapter(self) -> Dict[str, Any]:
+    async def _initialize_adapter(
+        self,
+        detected: Optional[DetectionResult] = None
+    ) -> Dict[str, Any]:
         """
         Initialize adapter based on detected tool
         
         ADR Note: Creates appropriate adapter (IDA or Ghidra) based on
         detection results. IDA adapter uses RPC URL, Ghidra uses install path.
+        Callers that already ran detection can pass the result to skip it.
         """
-        detected = self.tool_detector.detect_available()
+        if detected is None:
+            detected = self.tool_detector.detect_available()
         
         if not detected or not detected.is_available:
             return {
@@ -713,9 +724,11 @@ class MCPProtocolHandler:
                 text="Error: Either process_name or process_id must be provided"
             )]
         
+        image_format = "jpeg" if arguments.get("format") == "jpeg" else "png"
         result = self.visual_analyzer.capture_process_window(
             process_name=process_name,
-            process_id=process_id
+            process_id=process_id,
+            image_format=image_format
         )
         
         if result is None:
@@ -733,7 +746,7 @@ class MCPProtocolHandler:
             ImageContent(
                 type="image",
                 data=result["screenshot_base64"],
-                mimeType="image/png"
+                mimeType=f"image/{image_format}"
             ) if result.get("screenshot_base64") else TextContent(
                 type="text",
                 text="Screenshot data available in result"
@@ -922,26 +935,26 @@ class MCPProtocolHandler:
         
         addresses = arguments.get("addresses", [])
         
-        # Set breakpoints via orchestrator
+        # Set breakpoints via orchestrator (batched through the adapter)
         result = self.orchestrator.set_breakpoints(addresses)
+        breakpoint_results = result.pop("breakpoints", None) or []
+        details = json.dumps({'summary': result, 'breakpoints': breakpoint_results}, indent=2)
         
         if result["success"]:
-            # Actually set breakpoints using adapter
-            breakpoint_results = []
-            for addr in result["addresses"]:
-                bp_result = self.current_adapter.set_breakpoint(
-                    int(addr, 16) if isinstance(addr, str) else addr,
-                    "write"  # Hardware write breakpoint
-                )
-                breakpoint_results.append({
-                    "address": addr,
-                    "success": bp_result.success,
-                    "error": bp_result.error
-                })
-            
             return [TextContent(
                 type="text",
-                text=f"Breakpoints set:\n{json.dumps({'summary': result, 'breakpoints': breakpoint_results}, indent=2)}"
+                text=f"Breakpoints set:\n{details}"
+            )]
+        elif any(bp.get("success") for bp in breakpoint_results):
+            # The adapter fails the whole batch if any address fails
+            return [TextContent(
+                type="text",
+                text=f"Breakpoints partially set:\n{details}"
+            )]
+        elif breakpoint_results:
+            return [TextContent(
+                type="text",
+                text=f"Failed to set breakpoints: {result.get('error', 'Unknown error')}\n{details}"
             )]
         else:
             return [TextContent(
@@ -10,11 +10,44 @@ import logging
 import struct
 from typing import List, Optional, Any
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .base_scanner import BaseMemoryScanner
 from .types import ScanResult, ScannerResult, ValueType
 
 logger = logging.getLogger(__name__)
 
+# Little-endian NumPy dtypes for value types that can be compared lane-wise
+# without packing the needle into bytes first
+_NUMERIC_DTYPES = {
+    ValueType.INT_8: "<i1",
+    ValueType.INT_16: "<i2",
+    ValueType.INT_32: "<i4",
+    ValueType.INT_64: "<i8",
+    ValueType.UINT_8: "<u1",
+    ValueType.UINT_16: "<u2",
+    ValueType.UINT_32: "<u4",
+    ValueType.UINT_64: "<u8",
+    ValueType.FLOAT: "<f4",
+    ValueType.DOUBLE: "<f8",
+}
+
+
+def _as_int(value: Any) -> int:
+    """
+    Convert a scan value to int without truncating
+    
+    ADR Note: int(100.7) would silently search for 100; a non-integral
+    value for an integer type is an error instead.
+    """
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"non-integral value {value} for an integer type")
+    return int(value)
+
 
 class CustomScanner(BaseMemoryScanner):
     """
@@ -27,6 +60,7 @@ class CustomScanner(BaseMemoryScanner):
     def __init__(self, process_name: Optional[str] = None, process_id: Optional[int] = None):
         super().__init__(process_name, process_id)
         self.process_handle = None
+        # Each region: {"base": int, "size": int, "protection": str, "module": str}
         self.memory_regions: List[dict] = []
     
     def connect(self) -> ScannerResult:
@@ -118,20 +152,30 @@ class CustomScanner(BaseMemoryScanner):
         results = []
         
         try:
-            # Convert value to bytes based on type
-            value_bytes = self._value_to_bytes(value, value_type)
-            if not value_bytes:
+            size = self._value_size(value, value_type)
+            if not size:
                 return []
             
-            # Scan memory regions
-            # This is a placeholder - full implementation would:
-            # 1. Iterate through all memory regions
-            # 2. Read memory in chunks
-            # 3. Search for value_bytes
-            # 4. Create ScanResult for each match
+            for region in self.memory_regions:
+                try:
+                    data = self.process_handle.read_bytes(region["base"], region["size"])
+                except Exception:
+                    continue
+                
+                for offset in self._find_value_offsets(data, value, value_type):
+                    results.append(ScanResult(
+                        address=f"0x{region['base'] + offset:X}",
+                        value=value,
+                        value_type=value_type,
+                        size=size,
+                        protection=region.get("protection"),
+                        module=region.get("module"),
+                        offset=offset
+                    ))
             
-            logger.warning("Custom scanner initial_scan not fully implemented")
-            # TODO: Implement full memory scanning logic
+            if not self.memory_regions:
+                logger.warning("Custom scanner initial_scan not fully implemented")
+                # TODO: Implement full memory region enumeration
         
         except Exception as e:
             logger.error(f"Scan failed: {e}")
@@ -204,25 +248,75 @@ class CustomScanner(BaseMemoryScanner):
         self.scan_count = 0
         return ScannerResult(success=True)
     
+    def _find_value_offsets(self, data: bytes, value: Any, value_type: ValueType) -> List[int]:
+        """
+        Find offsets of value within a memory buffer
+        
+        ADR Note: Numeric types are compared lane-wise over a typed NumPy view
+        of the buffer, so the needle is never packed with struct and each
+        vectorized compare covers many values at once. Only naturally aligned
+        matches are reported, which is how values are laid out in practice.
+        Strings and raw bytes fall back to a substring search.
+        """
+        dtype = _NUMERIC_DTYPES.get(value_type)
+        if dtype is not None and NUMPY_AVAILABLE:
+            itemsize = np.dtype(dtype).itemsize
+            usable = len(data) - len(data) % itemsize
+            if not usable:
+                return []
+            haystack = np.frombuffer(data, dtype=dtype, count=usable // itemsize)
+            try:
+                if haystack.dtype.kind in "iu":
+                    int_value = _as_int(value)
+                    info = np.iinfo(haystack.dtype)
+                    if not info.min <= int_value <= info.max:
+                        raise OverflowError(f"{int_value} out of range for {value_type.value}")
+                    needle = haystack.dtype.type(int_value)
+                else:
+                    needle = haystack.dtype.type(value)
+            except (OverflowError, ValueError, TypeError) as e:
+                logger.error(f"Invalid {value_type.value} scan value {value!r}: {e}")
+                return []
+            return (np.flatnonzero(haystack == needle) * itemsize).tolist()
+        
+        value_bytes = self._value_to_bytes(value, value_type)
+        if not value_bytes:
+            return []
+        
+        offsets = []
+        index = data.find(value_bytes)
+        while index != -1:
+            offsets.append(index)
+            index = data.find(value_bytes, index + 1)
+        return offsets
+    
+    def _value_size(self, value: Any, value_type: ValueType) -> Optional[int]:
+        """Get size in bytes of value for the given type"""
+        dtype = _NUMERIC_DTYPES.get(value_type)
+        if dtype is not None:
+            return int(dtype[2:])
+        value_bytes = self._value_to_bytes(value, value_type)
+        return len(value_bytes) if value_bytes else None
+    
     def _value_to_bytes(self, value: Any, value_type: ValueType) -> Optional[bytes]:
         """Convert value to bytes based on type"""
         try:
             if value_type == ValueType.INT_8:
-                return struct.pack("<b", int(value))
+                return struct.pack("<b", _as_int(value))
             elif value_type == ValueType.INT_16:
-                return struct.pack("<h", int(value))
+                return struct.pack("<h", _as_int(value))
             elif value_type == ValueType.INT_32:
-                return struct.pack("<i", int(value))
+                return struct.pack("<i", _as_int(value))
             elif value_type == ValueType.INT_64:
-                return struct.pack("<q", int(value))
+                return struct.pack("<q", _as_int(value))
             elif value_type == ValueType.UINT_8:
-                return struct.pack("<B", int(value))
+                return struct.pack("<B", _as_int(value))
             elif value_type == ValueType.UINT_16:
-                return struct.pack("<H", int(value))
+                return struct.pack("<H", _as_int(value))
             elif value_type == ValueType.UINT_32:
-                return struct.pack("<I", int(value))
+                return struct.pack("<I", _as_int(value))
             elif value_type == ValueType.UINT_64:
-                return struct.pack("<Q", int(value))
+                return struct.pack("<Q", _as_int(value))
             elif value_type == ValueType.FLOAT:
                 return struct.pack("<f", float(value))
             elif value_type == ValueType.DOUBLE:
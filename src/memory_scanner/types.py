@@ -4,10 +4,15 @@ Memory Scanner Types
 ADR Note: Common data structures for memory scanner operations.
 """
 
+import sys
 from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Any, Dict
 
+# dataclass(slots=True) needs Python 3.10+. Explicit __slots__ cannot be
+# combined with field defaults, so older interpreters get plain dataclasses.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class ValueType(str, Enum):
     """Supported value types for memory scanning"""
@@ -34,7 +39,7 @@ class ScanStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScanResult:
     """
     Result of a memory scan operation
@@ -53,7 +58,7 @@ class ScanResult:
     metadata: Optional[Dict[str, Any]] = None  # Additional metadata
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScannerResult:
     """
     Result of a scanner operation
@@ -10,8 +10,11 @@ ADR Note: Coordinates the complete reverse engineering workflow:
 This orchestrator manages the communication between all components.
 """
 
+import array
+import base64
 import logging
 import threading
+from collections import deque
 from typing import Optional, Dict, List, Any, Callable
 from queue import Queue
 
@@ -25,12 +28,17 @@ except ImportError:
 
 try:
     from ..memory_scanner import MemoryScannerFactory, BaseMemoryScanner
+    from ..memory_scanner.types import ValueType
     MEMORY_SCANNER_AVAILABLE = True
+    _VALUE_TYPES = {v.value: v for v in ValueType}
 except ImportError:
     MEMORY_SCANNER_AVAILABLE = False
     MemoryScannerFactory = None
     BaseMemoryScanner = None
+    ValueType = None
+    _VALUE_TYPES = {}
 
+from ..adapters import BreakpointType
 from ..communication import (
     ComponentServer,
     ComponentClient,
@@ -42,6 +50,18 @@ from ..communication import (
 logger = logging.getLogger(__name__)
 
 
+def _to_address_array(addresses) -> array.array:
+    """Pack hex string or integer addresses into a contiguous uint64 array"""
+    packed = array.array('Q')
+    packed.extend(int(a, 16) if isinstance(a, str) else a for a in addresses)
+    return packed
+
+
+def _format_addresses(addresses) -> List[str]:
+    """Format packed addresses as hex strings for external APIs"""
+    return [f"0x{a:X}" for a in addresses]
+
+
 class WorkflowOrchestrator:
     """
     Orchestrates the complete reverse engineering workflow
@@ -55,11 +75,21 @@ class WorkflowOrchestrator:
     The orchestrator manages the communication flow and state.
     """
     
+    # Coalescing window for visual change events (milliseconds)
+    BATCH_MS = 100
+    
+    # Maximum number of detected values kept in history
+    MAX_DETECTED_VALUES = 1024
+    
+    # Maximum addresses per batched breakpoint request to the adapter
+    BREAKPOINT_BATCH_SIZE = 256
+    
     def __init__(
         self,
         process_name: Optional[str] = None,
         process_id: Optional[int] = None,
-        memory_scanner_backend: Optional[str] = None
+        memory_scanner_backend: Optional[str] = None,
+        batch_ms: Optional[int] = None
     ):
         """
         Initialize workflow orchestrator
@@ -68,9 +98,12 @@ class WorkflowOrchestrator:
             process_name: Name of target process
             process_id: PID of target process
             memory_scanner_backend: Preferred memory scanner backend
+            batch_ms: Window for coalescing visual changes into one scan
+                     (None = BATCH_MS, 0 = scan on every change)
         """
         self.process_name = process_name
         self.process_id = process_id
+        self.batch_ms = self.BATCH_MS if batch_ms is None else batch_ms
         
         # Components
         self.visual_analyzer: Optional[VisualAnalyzer] = None
@@ -83,15 +116,32 @@ class WorkflowOrchestrator:
         
         # State
         self.is_running = False
-        self.current_scan_addresses: List[str] = []
-        self.detected_values: List[Dict[str, Any]] = []
+        # Packed uint64 addresses; formatted to hex only at API boundaries
+        self.current_scan_addresses: array.array = array.array('Q')
+        self._address_set: frozenset = frozenset()
+        self._last_callback_hash: Optional[int] = None
+        # Bounded history; deque.append is atomic, so the communication
+        # thread can append while the MCP thread reads without a lock
+        self.detected_values: deque = deque(maxlen=self.MAX_DETECTED_VALUES)
         self.workflow_state: Dict[str, Any] = {
             "visual_monitoring": False,
             "memory_scanning": False,
             "breakpoints_set": False,
-            "current_addresses": []
+            "current_addresses": self.current_scan_addresses
         }
         
+        # Status snapshot memoization; bump _state_version on every mutation
+        self._state_version = 0
+        self._status_cache: tuple = (None, None)
+        
+        # Scan value type, resolved once per workflow in start_workflow
+        self._value_type_enum = ValueType.INT_32 if ValueType else None
+        
+        # Visual change batching
+        self._pending_event: Optional[Message] = None
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_lock = threading.Lock()
+        
         # Callbacks
         self.on_address_found: Optional[Callable[[List[str]], None]] = None
         self.on_breakpoint_hit: Optional[Callable[[str], None]] = None
@@ -140,6 +190,15 @@ class WorkflowOrchestrator:
                 MessageType.SCAN_RESULT.value,
                 self._handle_scan_result
             )
+            # In-process components bypass JSON/TCP via the local fast path
+            self.communication_server.register_local_handler(
+                MessageType.VISUAL_CHANGE.value,
+                self._handle_visual_change
+            )
+            self.communication_server.register_local_handler(
+                MessageType.SCAN_RESULT.value,
+                self._handle_scan_result
+            )
             self.communication_port = self.communication_server.start()
             logger.info(f"Communication server started on port {self.communication_port}")
         except Exception as e:
@@ -173,10 +232,14 @@ class WorkflowOrchestrator:
         
         # Start visual monitoring
         if self.visual_analyzer:
-            success = self.visual_analyzer.start_monitoring(regions)
+            success = self.visual_analyzer.start_monitoring(
+                regions,
+                callback=self._on_local_visual_change
+            )
             if not success:
                 return {"success": False, "error": "Failed to start visual monitoring"}
             self.workflow_state["visual_monitoring"] = True
+            self._state_version += 1
         else:
             return {"success": False, "error": "Visual analyzer not available"}
         
@@ -186,12 +249,14 @@ class WorkflowOrchestrator:
         
         self.is_running = True
         self.workflow_state["value_type"] = value_type
+        self._value_type_enum = _VALUE_TYPES.get(value_type, ValueType.INT_32)
+        self._state_version += 1
         
         logger.info("Workflow started")
         return {
             "success": True,
             "communication_port": self.communication_port,
-            "state": self.workflow_state
+            "state": self._state_snapshot()
         }
     
     def stop_workflow(self) -> Dict[str, Any]:
@@ -199,6 +264,13 @@ class WorkflowOrchestrator:
         if not self.is_running:
             return {"success": False, "error": "Workflow not running"}
         
+        # Drop any pending batched visual change
+        with self._batch_lock:
+            if self._batch_timer:
+                self._batch_timer.cancel()
+            self._batch_timer = None
+            self._pending_event = None
+        
         # Stop visual monitoring
         if self.visual_analyzer:
             self.visual_analyzer.stop_monitoring()
@@ -210,18 +282,45 @@ class WorkflowOrchestrator:
             self.workflow_state["memory_scanning"] = False
         
         self.is_running = False
-        self.current_scan_addresses = []
-        self.detected_values = []
+        self._set_scan_addresses(array.array('Q'))
+        self._last_callback_hash = None
+        self.workflow_state["current_addresses"] = self.current_scan_addresses
+        self.detected_values.clear()
+        self._state_version += 1
         
         logger.info("Workflow stopped")
         return {"success": True}
     
+    def _on_local_visual_change(self, result: Dict[str, Any]):
+        """
+        Forward a change from the in-process visual analyzer
+        
+        ADR Note: The visual analyzer runs in this process, so its changes
+        are posted to the communication server's local queue as Message
+        objects instead of being serialized over TCP. Changes with no
+        extracted value are dropped here, since there is nothing to scan
+        memory for.
+        """
+        extracted = result.get("extracted_value") or {}
+        value = extracted.get("value")
+        if value is None:
+            return
+        message = MessageCodec.create_visual_change(
+            value=value,
+            coordinates=result.get("coordinates", {})
+        )
+        if self.communication_server and self.communication_server.send_local(message):
+            return
+        self._handle_visual_change(message)
+    
     def _handle_visual_change(self, message: Message):
         """
         Handle visual change detected by visual analyzer
         
         ADR Note: When a visual change is detected, trigger memory scan
         for the detected value. This is the first step in the workflow.
+        Changes arriving within batch_ms of each other are coalesced so only
+        one scan runs per window, using the latest value.
         """
         if not self.is_running:
             return
@@ -237,6 +336,34 @@ class WorkflowOrchestrator:
             "coordinates": coordinates,
             "timestamp": message.timestamp
         })
+        self._state_version += 1
+        
+        if self.batch_ms <= 0:
+            self._dispatch_scan(message)
+            return
+        
+        with self._batch_lock:
+            self._pending_event = message
+            if self._batch_timer is None:
+                self._batch_timer = threading.Timer(self.batch_ms / 1000, self._flush_pending)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+    
+    def _flush_pending(self):
+        """Run one scan for the latest visual change in the batch window"""
+        with self._batch_lock:
+            message = self._pending_event
+            self._pending_event = None
+            self._batch_timer = None
+        
+        if message is None or not self.is_running:
+            return
+        
+        self._dispatch_scan(message)
+    
+    def _dispatch_scan(self, message: Message):
+        """Run initial or filter scan for a visual change"""
+        value = message.payload.get("value")
         
         # Determine if this is initial scan or filter scan
         if not self.current_scan_addresses:
@@ -253,18 +380,10 @@ class WorkflowOrchestrator:
         
         logger.info(f"Performing initial scan for value: {value}")
         
-        # Determine value type
-        value_type = self.workflow_state.get("value_type", "int32")
-        from ..memory_scanner.types import ValueType
-        
-        try:
-            value_type_enum = ValueType(value_type)
-        except ValueError:
-            value_type_enum = ValueType.INT_32  # Default
-        
         # Perform scan
-        results = self.memory_scanner.initial_scan(value, value_type_enum)
-        self.current_scan_addresses = [r.address for r in results]
+        results = self.memory_scanner.initial_scan(value, self._value_type_enum)
+        self._set_scan_addresses(_to_address_array(r.address for r in results))
+        self._state_version += 1
         
         logger.info(f"Initial scan found {len(results)} addresses")
         
@@ -272,9 +391,7 @@ class WorkflowOrchestrator:
             self.workflow_state["memory_scanning"] = True
             self.workflow_state["current_addresses"] = self.current_scan_addresses
             
-            # Notify callback if set
-            if self.on_address_found:
-                self.on_address_found(self.current_scan_addresses)
+            self._notify_address_found()
     
     def _perform_filter_scan(self, value: Any):
         """Perform filter scan on previous results"""
@@ -283,18 +400,10 @@ class WorkflowOrchestrator:
         
         logger.info(f"Performing filter scan for value: {value}")
         
-        # Determine value type
-        value_type = self.workflow_state.get("value_type", "int32")
-        from ..memory_scanner.types import ValueType
-        
-        try:
-            value_type_enum = ValueType(value_type)
-        except ValueError:
-            value_type_enum = ValueType.INT_32  # Default
-        
         # Perform filter scan
-        results = self.memory_scanner.filter_scan(value, value_type_enum)
-        self.current_scan_addresses = [r.address for r in results]
+        results = self.memory_scanner.filter_scan(value, self._value_type_enum)
+        self._set_scan_addresses(_to_address_array(r.address for r in results))
+        self._state_version += 1
         
         logger.info(f"Filter scan found {len(results)} addresses")
         
@@ -305,18 +414,66 @@ class WorkflowOrchestrator:
             if len(results) <= 5:
                 logger.info(f"Few addresses remaining ({len(results)}). Ready for breakpoint setting.")
             
-            # Notify callback if set
-            if self.on_address_found:
-                self.on_address_found(self.current_scan_addresses)
+            self._notify_address_found()
+    
+    def _set_scan_addresses(self, addresses: array.array):
+        """
+        Replace the current scan candidates
+        
+        ADR Note: A frozenset of the addresses is rebuilt alongside the array
+        so contains_address() is O(1) instead of a linear scan.
+        """
+        self.current_scan_addresses = addresses
+        self._address_set = frozenset(addresses)
+    
+    def _notify_address_found(self):
+        """
+        Invoke on_address_found unless the candidate set is unchanged
+        
+        ADR Note: Noise between real UI changes often leaves the candidate
+        set as-is; skipping the callback then avoids redundant downstream work.
+        """
+        if not self.on_address_found:
+            return
+        
+        set_hash = hash(self._address_set)
+        if set_hash == self._last_callback_hash:
+            logger.debug("Address set unchanged, skipping on_address_found")
+            return
+        
+        self._last_callback_hash = set_hash
+        self.on_address_found(_format_addresses(self.current_scan_addresses))
+    
+    def contains_address(self, address) -> bool:
+        """
+        Check whether an address is among the current scan candidates
+        
+        Args:
+            address: Address as int or hex string (e.g. "0x7FF6...")
+        
+        Returns:
+            True if the address is a current candidate
+        """
+        if isinstance(address, str):
+            address = int(address, 16)
+        return address in self._address_set
     
     def _handle_scan_result(self, message: Message):
         """Handle scan result from memory scanner"""
-        addresses = message.payload.get("addresses", [])
+        packed = message.payload.get("addresses_packed")
         count = message.payload.get("count", 0)
         
         logger.info(f"Received scan result: {count} addresses")
-        self.current_scan_addresses = addresses
-        self.workflow_state["current_addresses"] = addresses
+        if packed is not None:
+            self._set_scan_addresses(
+                MessageCodec.decode_scan_result(base64.b64decode(packed))
+            )
+        else:
+            self._set_scan_addresses(
+                _to_address_array(message.payload.get("addresses", []))
+            )
+        self.workflow_state["current_addresses"] = self.current_scan_addresses
+        self._state_version += 1
     
     def set_breakpoints(self, addresses: Optional[List[str]] = None) -> Dict[str, Any]:
         """
@@ -324,6 +481,8 @@ class WorkflowOrchestrator:
         
         ADR Note: Uses the RE tool adapter to set breakpoints. When breakpoints
         are hit, the orchestrator will decompile and analyze the code.
+        Addresses are sent in batches of BREAKPOINT_BATCH_SIZE so each batch
+        costs one adapter round-trip while message size stays bounded.
         
         Args:
             addresses: Addresses to set breakpoints at (if None, uses current scan addresses)
@@ -335,39 +494,71 @@ class WorkflowOrchestrator:
             return {"success": False, "error": "RE tool adapter not set"}
         
         if addresses is None:
-            addresses = self.current_scan_addresses
+            packed = self.current_scan_addresses
+        else:
+            packed = _to_address_array(addresses)
         
-        if not addresses:
+        if not packed:
             return {"success": False, "error": "No addresses to set breakpoints at"}
         
         # Set breakpoints using adapter
         # Note: This requires the adapter to be set by the MCP server
-        logger.info(f"Setting breakpoints at {len(addresses)} addresses")
+        logger.info(f"Setting breakpoints at {len(packed)} addresses")
         
-        # TODO: Implement breakpoint setting via adapter
-        # For now, just update state
-        self.workflow_state["breakpoints_set"] = True
+        breakpoints = []
+        errors = []
+        for start in range(0, len(packed), self.BREAKPOINT_BATCH_SIZE):
+            batch = packed[start:start + self.BREAKPOINT_BATCH_SIZE].tolist()
+            result = self.re_adapter.set_breakpoints(batch, BreakpointType.WRITE)
+            breakpoints.extend((result.data or {}).get("breakpoints", []))
+            if not result.success:
+                errors.append(result.error)
+        
+        self.workflow_state["breakpoints_set"] = any(bp["success"] for bp in breakpoints)
+        self._state_version += 1
         
         return {
-            "success": True,
-            "addresses": addresses,
-            "count": len(addresses)
+            "success": not errors,
+            "error": errors[0] if errors else None,
+            "addresses": _format_addresses(packed),
+            "count": len(packed),
+            "breakpoints": breakpoints
         }
     
+    def _state_snapshot(self) -> Dict[str, Any]:
+        """Copy workflow state with addresses formatted for JSON"""
+        state = self.workflow_state.copy()
+        state["current_addresses"] = _format_addresses(self.current_scan_addresses)
+        return state
+    
     def get_workflow_status(self) -> Dict[str, Any]:
-        """Get current workflow status"""
-        return {
+        """
+        Get current workflow status
+        
+        ADR Note: Status is polled frequently by AI clients, so the snapshot
+        is memoized until the state version or a component changes. Callers
+        must treat the returned dictionary as read-only.
+        """
+        components = {
+            "visual_analyzer": self.visual_analyzer is not None,
+            "memory_scanner": self.memory_scanner is not None,
+            "re_adapter": self.re_adapter is not None,
+            "communication_server": self.communication_server is not None
+        }
+        key = (self._state_version, tuple(components.values()))
+        cached_status, cached_key = self._status_cache
+        if cached_key == key:
+            return cached_status
+        
+        status = {
             "is_running": self.is_running,
-            "state": self.workflow_state.copy(),
+            "state": self._state_snapshot(),
             "detected_values_count": len(self.detected_values),
             "current_addresses_count": len(self.current_scan_addresses),
-            "components": {
-                "visual_analyzer": self.visual_analyzer is not None,
-                "memory_scanner": self.memory_scanner is not None,
-                "re_adapter": self.re_adapter is not None,
-                "communication_server": self.communication_server is not None
-            }
+            "components": components
         }
+        self._status_cache = (status, key)
+        return status
     
     def cleanup(self):
         """Cleanup resources"""
@@ -6,15 +6,29 @@ installation method. Detection runs on startup and can be manually triggered.
 Results are cached to avoid repeated expensive checks.
 """
 
+import os
+import json
+import time
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
 from typing import Optional, Dict
 
 from .types import ToolType, DetectionResult
-from .ida_detector import IDADetector
+from .ida_detector import IDADetector, clear_detect_cache
 from .ghidra_detector import GhidraDetector
 
 logger = logging.getLogger(__name__)
 
+# On-disk detection cache shared across process restarts
+CACHE_FILE = Path.home() / ".cache" / "re_orch" / "tools.json"
+CACHE_TTL = 3600  # seconds
+
+# Environment variables that influence detection results
+FINGERPRINT_ENV_VARS = ("GHIDRA_INSTALL_DIR", "IDA_PATH")
+
 
 class ToolDetector:
     """
@@ -22,7 +36,8 @@ class ToolDetector:
     
     ADR Note: Detector tries multiple methods and returns the first successful
     detection. Preference can be set via configuration. Detection is cached
-    to avoid repeated expensive operations.
+    in memory and on disk (keyed by an environment and install-directory
+    fingerprint) so repeated launches skip the filesystem probes.
     """
     
     def __init__(self, preferred_tool: Optional[str] = None):
@@ -35,27 +50,175 @@ class ToolDetector:
         """
         self.preferred_tool = preferred_tool
         self._cache: Optional[Dict[ToolType, DetectionResult]] = None
+        # Per-tool results from early-exit runs, reused by a later full detect_all
+        self._tool_results: Dict[ToolType, DetectionResult] = {}
         self.ida_detector = IDADetector()
         self.ghidra_detector = GhidraDetector()
+        self._fingerprint = self._compute_fingerprint()
     
-    def detect_all(self, use_cache: bool = True) -> Dict[ToolType, DetectionResult]:
+    def _compute_fingerprint(self) -> str:
+        """
+        Hash of everything a cached detection result depends on
+        
+        ADR Note: Covers the detection environment variables and the
+        st_mtime_ns of the directories they name and of every candidate
+        parent directory. Installing, removing or renaming an IDA/Ghidra
+        directory changes its parent's mtime, which invalidates the cache
+        without waiting for CACHE_TTL. One stat per path is far cheaper
+        than the scans and probes it saves.
+        """
+        env = [(k, os.getenv(k)) for k in FINGERPRINT_ENV_VARS]
+        paths = [value for _, value in env if value]
+        paths.extend(str(parent) for parent, _ in self.ida_detector._get_candidate_parents())
+        paths.extend(str(parent) for parent in self.ghidra_detector._get_candidate_parents())
+        
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                mtimes.append((path, None))
+        
+        return hashlib.blake2b(repr((sorted(env), mtimes)).encode()).hexdigest()
+    
+    def detect_all(
+        self,
+        use_cache: bool = True,
+        stop_on_first: bool = False
+    ) -> Dict[ToolType, DetectionResult]:
         """
         Detect all available tools
         
         ADR Note: Returns results for all tools, not just the first one.
         This allows users to see what's available and manually select if needed.
+        Detectors run concurrently since each is dominated by filesystem and
+        process probes that release the GIL. With stop_on_first, tools are
+        probed one at a time in preference order and the (partial) results
+        are returned as soon as one is available - enough for "is anything
+        installed?" callers.
+        
+        Args:
+            use_cache: Reuse in-memory/on-disk results
+            stop_on_first: Stop probing at the first available tool
         """
         if use_cache and self._cache is not None:
             return self._cache
         
-        results = {
-            ToolType.IDA_PRO: self.ida_detector.detect(),
-            ToolType.GHIDRA: self.ghidra_detector.detect(),
-        }
+        results = self._load_disk_cache() if use_cache else None
+        if results is None and stop_on_first:
+            return self._detect_first(force=not use_cache)
+        
+        if results is None:
+            known = self._tool_results if use_cache else {}
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                ida_future = (
+                    None if ToolType.IDA_PRO in known
+                    else executor.submit(self.ida_detector.detect, force=not use_cache)
+                )
+                ghidra_future = (
+                    None if ToolType.GHIDRA in known
+                    else executor.submit(self.ghidra_detector.detect)
+                )
+                results = {
+                    ToolType.IDA_PRO: known[ToolType.IDA_PRO] if ida_future is None else ida_future.result(),
+                    ToolType.GHIDRA: known[ToolType.GHIDRA] if ghidra_future is None else ghidra_future.result(),
+                }
+            self._save_disk_cache(results)
         
         self._cache = results
+        self._tool_results = dict(results)
         return results
     
+    def _preferred_type(self) -> Optional[ToolType]:
+        """ToolType for preferred_tool, or None"""
+        if not self.preferred_tool:
+            return None
+        return (
+            ToolType.IDA_PRO if self.preferred_tool.lower() == "ida"
+            else ToolType.GHIDRA if self.preferred_tool.lower() == "ghidra"
+            else None
+        )
+    
+    def _detect_first(self, force: bool = False) -> Dict[ToolType, DetectionResult]:
+        """Probe tools sequentially (preferred, IDA, Ghidra) until one is available"""
+        order = [ToolType.IDA_PRO, ToolType.GHIDRA]
+        preferred_type = self._preferred_type()
+        if preferred_type:
+            order.remove(preferred_type)
+            order.insert(0, preferred_type)
+        
+        results: Dict[ToolType, DetectionResult] = {}
+        for tool_type in order:
+            result = None if force else self._tool_results.get(tool_type)
+            if result is None:
+                if tool_type == ToolType.IDA_PRO:
+                    result = self.ida_detector.detect(force=force)
+                else:
+                    result = self.ghidra_detector.detect()
+                self._tool_results[tool_type] = result
+            results[tool_type] = result
+            if result.is_available:
+                break
+        return results
+    
+    def _load_disk_cache(self) -> Optional[Dict[ToolType, DetectionResult]]:
+        """Load detection results from disk if fresh and fingerprint matches"""
+        try:
+            data = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+            if data.get("fingerprint") != self._fingerprint:
+                return None
+            if time.time() - data.get("ts", 0) >= CACHE_TTL:
+                return None
+            results = {
+                ToolType(key): DetectionResult.from_dict(value)
+                for key, value in data["results"].items()
+            }
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable detection cache: {e}")
+            return None
+        
+        return self._refresh_running(results)
+    
+    def _refresh_running(
+        self,
+        results: Dict[ToolType, DetectionResult]
+    ) -> Optional[Dict[ToolType, DetectionResult]]:
+        """
+        Recompute is_running for cached results of available tools
+        
+        ADR Note: Whether a tool is running changes far more often than where
+        it is installed, so it is never trusted from disk. A result that was
+        only found because the tool was running is dropped (forcing a fresh
+        detection) once the process is gone.
+        """
+        detectors = {
+            ToolType.IDA_PRO: self.ida_detector,
+            ToolType.GHIDRA: self.ghidra_detector,
+        }
+        refreshed = {}
+        for tool_type, result in results.items():
+            if result.is_available and tool_type in detectors:
+                running = detectors[tool_type].is_running()
+                if result.detection_method == "running_process" and not running:
+                    return None
+                result = replace(result, is_running=running)
+            refreshed[tool_type] = result
+        return refreshed
+    
+    def _save_disk_cache(self, results: Dict[ToolType, DetectionResult]):
+        """Persist detection results to disk"""
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            CACHE_FILE.write_text(json.dumps({
+                "fingerprint": self._fingerprint,
+                "ts": time.time(),
+                "results": {k.value: v.to_dict() for k, v in results.items()}
+            }), encoding="utf-8")
+        except Exception as e:
+            logger.debug(f"Failed to write detection cache: {e}")
+    
     def detect_available(self) -> Optional[DetectionResult]:
         """
         Detect and return the first available tool
@@ -67,11 +230,7 @@ class ToolDetector:
         
         # Check preferred tool first if set
         if self.preferred_tool:
-            preferred_type = (
-                ToolType.IDA_PRO if self.preferred_tool.lower() == "ida"
-                else ToolType.GHIDRA if self.preferred_tool.lower() == "ghidra"
-                else None
-            )
+            preferred_type = self._preferred_type()
             
             if preferred_type and all_results[preferred_type].is_available:
                 logger.info(f"Using preferred tool: {preferred_type.value}")
@@ -89,5 +248,13 @@ class ToolDetector:
     def clear_cache(self):
         """Clear detection cache to force re-detection"""
         self._cache = None
+        self._tool_results = {}
+        clear_detect_cache()
+        try:
+            os.unlink(CACHE_FILE)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Failed to remove detection cache: {e}")
         logger.debug("Detection cache cleared")
 
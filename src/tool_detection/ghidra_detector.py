@@ -6,20 +6,52 @@ availability. Ghidra is Java-based, so detection is different from IDA Pro.
 """
 
 import os
+import re
 import sys
 import logging
+import mmap
+import functools
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Iterator, Tuple, Set
 
 from .types import DetectionResult, ToolType
 
 logger = logging.getLogger(__name__)
 
 
+def _version_key(name: str) -> Tuple[int, ...]:
+    """Sort key for install directory names, e.g. "ghidra_11.0_PUBLIC" -> (11, 0)"""
+    return tuple(int(part) for part in re.findall(r"\d+", name))
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_ghidra_module() -> bool:
+    """
+    Check if ghidra_bridge module is available
+    
+    ADR Note: Import availability does not change during a process lifetime,
+    so the probe runs once and later detections reuse the cached answer.
+    """
+    try:
+        import ghidra_bridge
+        return True
+    except ImportError:
+        # Also check for direct Ghidra Python (if running in Ghidra)
+        try:
+            import ghidra
+            return True
+        except ImportError:
+            return False
+
+
 class GhidraDetector:
     """Detects Ghidra installation and availability"""
     
+    def __init__(self):
+        # Running-process result, memoized for the duration of one detect()
+        self._running_cache: Optional[bool] = None
+    
     def detect(self) -> DetectionResult:
         """
         Detect Ghidra using multiple methods
@@ -30,6 +62,8 @@ class GhidraDetector:
         3. Python module (ghidra_bridge)
         4. Running Java process
         """
+        self._running_cache = None
+        
         # Method 1: Environment variable
         ghidra_dir = os.getenv("GHIDRA_INSTALL_DIR")
         if ghidra_dir and Path(ghidra_dir).exists():
@@ -39,16 +73,17 @@ class GhidraDetector:
             )
         
         # Method 2: Common installation paths
-        common_paths = self._get_common_paths()
-        for path in common_paths:
-            if path.exists() and self._is_ghidra_install(path):
+        for path, entry in self._iter_candidate_entries():
+            names = self._list_names(path)
+            if self._is_ghidra_install(path, names):
                 return self._create_result(
                     install_path=path,
-                    detection_method="common_path"
+                    detection_method="common_path",
+                    names=names
                 )
         
         # Method 3: Check for ghidra_bridge module
-        if self._check_python_module():
+        if _probe_ghidra_module():
             return DetectionResult(
                 tool_type=ToolType.GHIDRA,
                 is_available=True,
@@ -75,101 +110,125 @@ class GhidraDetector:
             error_message="Ghidra not found using any detection method"
         )
     
-    def _get_common_paths(self) -> list[Path]:
+    def _get_candidate_parents(self) -> list[Path]:
         """
-        Get common Ghidra installation paths
+        Get directories that commonly contain a Ghidra installation
         
         ADR Note: Includes project-local tools directory for development.
         Checks project-relative path first, then system-wide locations.
         """
-        paths = []
-        
         # Project-local tools directory (for development)
         # ADR Note: __file__ is src/tool_detection/ghidra_detector.py
         # So parent.parent.parent = project root (src -> project root)
         project_root = Path(__file__).parent.parent.parent
-        project_ghidra = project_root / "tools" / "ghidra"
-        if project_ghidra.exists():
-            paths.append(project_ghidra)
+        parents = [project_root / "tools"]
         
         if sys.platform == "win32":
             # Windows common paths
-            paths.extend([
-                Path("C:\\ghidra"),
-                Path("C:\\Program Files\\ghidra"),
-                Path("C:\\Program Files (x86)\\ghidra"),
-                Path.home() / "ghidra",
+            parents.extend([
+                Path("C:\\"),
+                Path("C:\\Program Files"),
+                Path("C:\\Program Files (x86)"),
+                Path.home(),
             ])
         elif sys.platform == "darwin":
             # macOS common paths
-            paths.extend([
-                Path("/Applications/ghidra"),
-                Path.home() / "ghidra",
+            parents.extend([
+                Path("/Applications"),
+                Path.home(),
             ])
         else:
             # Linux common paths
-            paths.extend([
-                Path("/opt/ghidra"),
-                Path("/usr/local/ghidra"),
-                Path.home() / "ghidra",
+            parents.extend([
+                Path("/opt"),
+                Path("/usr/local"),
+                Path.home(),
             ])
         
-        return paths
+        return parents
     
-    def _is_ghidra_install(self, path: Path) -> bool:
+    def _iter_candidate_entries(self) -> Iterator[Tuple[Path, os.DirEntry]]:
         """
-        Check if path is a valid Ghidra installation
+        Yield Ghidra-looking directories from the common parent directories
         
-        ADR Note: Checks for key files including pyGhidraRun which is used
-        for Python script execution. This is critical for the adapter integration.
+        ADR Note: One os.scandir per parent replaces a stat per hardcoded
+        candidate, and also picks up versioned directory names such as
+        "ghidra_11.0_PUBLIC". DirEntry type info avoids extra stat calls.
+        The newest version is tried first, as in IDADetector.
         """
-        # Look for key files/directories
-        required_items = [
-            path / "ghidraRun.bat",  # Windows
-            path / "ghidraRun",      # Linux/macOS
-            path / "support",        # Support directory (contains pyGhidraRun)
-            path / "Ghidra",         # Main Ghidra directory
-        ]
-        
-        # Check for pyGhidraRun specifically (important for Python integration)
-        pyghidra_items = [
-            path / "support" / "pyGhidraRun",      # Linux/macOS
-            path / "support" / "pyGhidraRun.bat",  # Windows
-        ]
-        
-        # At least one required item should exist
-        has_basic = any(item.exists() for item in required_items)
-        
-        # pyGhidraRun is preferred but not strictly required
-        has_pyghidra = any(item.exists() for item in pyghidra_items)
-        
-        return has_basic
+        for parent in self._get_candidate_parents():
+            try:
+                with os.scandir(parent) as it:
+                    entries = [
+                        entry for entry in it
+                        if entry.name.lower().startswith("ghidra")
+                        and entry.is_dir()
+                    ]
+            except OSError:
+                continue
+            
+            for entry in sorted(entries, key=lambda e: _version_key(e.name), reverse=True):
+                yield Path(entry.path), entry
     
-    def _check_python_module(self) -> bool:
-        """Check if ghidra_bridge module is available"""
+    def _list_names(self, path: Path) -> Set[str]:
+        """List child names of a directory with a single scandir"""
         try:
-            import ghidra_bridge
-            return True
-        except ImportError:
-            # Also check for direct Ghidra Python (if running in Ghidra)
-            try:
-                import ghidra
-                return True
-            except ImportError:
-                return False
+            with os.scandir(path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+    
+    def _is_ghidra_install(self, path: Path, names: Optional[Set[str]] = None) -> bool:
+        """
+        Check if path is a valid Ghidra installation
+        
+        ADR Note: Key files are checked by membership in a single directory
+        listing instead of one exists() call each. Callers that already
+        listed the directory can pass the names in.
+        """
+        if names is None:
+            names = self._list_names(path)
+        
+        # At least one key file/directory should exist:
+        # ghidraRun(.bat) launcher, support directory (contains pyGhidraRun),
+        # or the main Ghidra directory
+        return (
+            "support" in names
+            or "Ghidra" in names
+            or "ghidraRun" in names
+            or "ghidraRun.bat" in names
+        )
+    
+    def is_running(self) -> bool:
+        """Check whether Ghidra is running right now, ignoring the detect() memo"""
+        self._running_cache = None
+        return self._check_running_process()
     
     def _check_running_process(self) -> bool:
-        """Check if Ghidra process is running"""
+        """
+        Check if Ghidra process is running
+        
+        ADR Note: Processes are prefiltered by name so the full command line
+        is only read for Java processes. The result is memoized until the
+        next detect() call.
+        """
+        if self._running_cache is not None:
+            return self._running_cache
+        
+        running = False
         try:
             import psutil
-            for proc in psutil.process_iter(['name', 'cmdline']):
+            for proc in psutil.process_iter(['name']):
                 try:
-                    name = proc.info['name'].lower()
-                    cmdline = ' '.join(proc.info.get('cmdline', [])).lower()
+                    name = (proc.info['name'] or '').lower()
+                    if 'java' not in name:
+                        continue
                     
                     # Check for Java process with Ghidra in command line
-                    if 'java' in name and 'ghidra' in cmdline:
-                        return True
+                    cmdline = ' '.join(proc.cmdline()).lower()
+                    if 'ghidra' in cmdline:
+                        running = True
+                        break
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
         except ImportError:
@@ -177,18 +236,31 @@ class GhidraDetector:
         except Exception as e:
             logger.debug(f"Process check failed: {e}")
         
-        return False
+        self._running_cache = running
+        return running
     
-    def _create_result(self, install_path: Path, detection_method: str) -> DetectionResult:
-        """Create detection result with additional checks"""
+    def _create_result(
+        self,
+        install_path: Path,
+        detection_method: str,
+        names: Optional[Set[str]] = None
+    ) -> DetectionResult:
+        """
+        Create detection result with additional checks
+        
+        Args:
+            install_path: Detected installation directory
+            detection_method: How the installation was found
+            names: Child names of install_path, if already listed
+        """
         # Check if ghidra_bridge is available
-        python_module_available = self._check_python_module()
+        python_module_available = _probe_ghidra_module()
         
         # Check if running
         is_running = self._check_running_process()
         
         # Try to get version
-        version = self._get_version(install_path)
+        version = self._get_version(install_path, names)
         
         return DetectionResult(
             tool_type=ToolType.GHIDRA,
@@ -200,16 +272,28 @@ class GhidraDetector:
             detection_method=detection_method
         )
     
-    def _get_version(self, install_path: Path) -> Optional[str]:
-        """Try to determine Ghidra version"""
+    def _get_version(self, install_path: Path, names: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Try to determine Ghidra version
+        
+        ADR Note: application.properties is memory-mapped and searched as
+        bytes, so only the version line is ever decoded. When the install
+        directory listing is known, a missing Ghidra directory skips the
+        file open entirely.
+        """
         # Check for version in application.properties or similar
-        app_props = install_path / "Ghidra" / "application.properties"
-        if app_props.exists():
+        if names is None or "Ghidra" in names:
+            app_props = install_path / "Ghidra" / "application.properties"
             try:
-                with open(app_props, 'r') as f:
-                    for line in f:
-                        if 'application.version' in line.lower():
-                            version = line.split('=')[1].strip()
+                with open(app_props, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start = mm.find(b'application.version')
+                    if start >= 0:
+                        end = mm.find(b'\n', start)
+                        line = mm[start:end if end >= 0 else len(mm)]
+                        _, _, version = line.partition(b'=')
+                        version = version.strip().decode('ascii', 'ignore')
+                        if version:
                             return version
             except Exception:
                 pass
@@ -7,21 +7,127 @@ Python modules, and running processes.
 """
 
 import os
+import re
 import sys
 import logging
+import time
+import plistlib
+import functools
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Dict, Iterator, List, Optional, Set, Tuple
 
 from .types import DetectionResult, ToolType
 
 logger = logging.getLogger(__name__)
 
+# Process-wide memo of the last detect() result: (monotonic timestamp, result)
+DETECT_CACHE_TTL = 60.0
+_detect_cache: Optional[Tuple[float, DetectionResult]] = None
+
+
+def clear_detect_cache():
+    """Drop the process-wide detect() memo so the next call detects again"""
+    global _detect_cache
+    _detect_cache = None
+
+
+# Executable names whose presence marks a directory as an IDA Pro install
+IDA_EXECUTABLES = frozenset({
+    "ida", "ida64", "idat", "idat64",
+    "ida.exe", "ida64.exe", "idat.exe", "idat64.exe",
+})
+
+
+def _version_key(name: str) -> Tuple[int, ...]:
+    """Sort key for install directory names, e.g. "IDA Pro 9.0" -> (9, 0)"""
+    return tuple(int(part) for part in re.findall(r"\d+", name))
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_ida_module() -> bool:
+    """
+    Check if idapython module is available
+    
+    ADR Note: Import availability does not change during a process lifetime,
+    so the probe runs once and later detections reuse the cached answer.
+    """
+    try:
+        import idaapi
+        return True
+    except ImportError:
+        return False
+
+
+def _read_file_version(path: str) -> Optional[str]:
+    """
+    Read the fixed file version from a Windows PE version resource
+    
+    ADR Note: Reading VS_FIXEDFILEINFO through version.dll takes
+    microseconds, while running the executable with -v spawns a process
+    (and risks launching the GUI).
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+        
+        version_dll = ctypes.windll.version
+        size = version_dll.GetFileVersionInfoSizeW(path, None)
+        if not size:
+            return None
+        
+        buffer = ctypes.create_string_buffer(size)
+        if not version_dll.GetFileVersionInfoW(path, 0, size, buffer):
+            return None
+        
+        info = ctypes.c_void_p()
+        length = wintypes.UINT()
+        if not version_dll.VerQueryValueW(buffer, "\\", ctypes.byref(info), ctypes.byref(length)):
+            return None
+        
+        # VS_FIXEDFILEINFO: dwSignature, dwStrucVersion, dwFileVersionMS, dwFileVersionLS, ...
+        fixed = ctypes.cast(info, ctypes.POINTER(wintypes.DWORD * 4)).contents
+        high, low = fixed[2], fixed[3]
+        return f"{high >> 16}.{high & 0xFFFF}.{low >> 16}.{low & 0xFFFF}"
+    except Exception as e:
+        logger.debug(f"Failed to read version resource from {path}: {e}")
+        return None
+
 
 class IDADetector:
     """Detects IDA Pro installation and availability"""
     
-    def detect(self) -> DetectionResult:
+    # Registry InstallDir lookups, keyed by (hkey, key_path), for the process
+    # lifetime. None records a key without a usable install directory.
+    _registry_cache: ClassVar[Dict[Tuple[int, str], Optional[str]]] = {}
+    
+    def __init__(self):
+        # Running-process result, memoized for the duration of one detect()
+        self._running_cache: Optional[bool] = None
+    
+    def detect(self, force: bool = False) -> DetectionResult:
+        """
+        Detect IDA Pro, reusing a result from the last DETECT_CACHE_TTL seconds
+        
+        ADR Note: Full detection (registry, directory scans, process list,
+        version probe) does not change between back-to-back calls, so the
+        result is shared process-wide for a short TTL.
+        
+        Args:
+            force: Ignore the cached result and detect again
+        """
+        global _detect_cache
+        
+        if not force and _detect_cache is not None:
+            cached_at, result = _detect_cache
+            if time.monotonic() - cached_at < DETECT_CACHE_TTL:
+                return result
+        
+        result = self._detect()
+        _detect_cache = (time.monotonic(), result)
+        return result
+    
+    def _detect(self) -> DetectionResult:
         """
         Detect IDA Pro using multiple methods
         
@@ -32,6 +138,8 @@ class IDADetector:
         4. Python module (idapython available)
         5. Running process (IDA is currently running)
         """
+        self._running_cache = None
+        
         # Method 1: Environment variable
         ida_path = os.getenv("IDA_PATH")
         if ida_path and Path(ida_path).exists():
@@ -50,16 +158,15 @@ class IDADetector:
                 )
         
         # Method 3: Common installation paths
-        common_paths = self._get_common_paths()
-        for path in common_paths:
-            if path.exists():
-                return self._create_result(
-                    install_path=path,
-                    detection_method="common_path"
-                )
+        common_path = next(self._iter_common_paths(), None)
+        if common_path:
+            return self._create_result(
+                install_path=common_path,
+                detection_method="common_path"
+            )
         
         # Method 4: Check for idapython module
-        if self._check_python_module():
+        if _probe_ida_module():
             return DetectionResult(
                 tool_type=ToolType.IDA_PRO,
                 is_available=True,
@@ -87,7 +194,12 @@ class IDADetector:
         )
     
     def _check_registry(self) -> Optional[str]:
-        """Check Windows registry for IDA Pro installation"""
+        """
+        Check Windows registry for IDA Pro installation
+        
+        ADR Note: Each key is opened and validated at most once per process;
+        later detect() calls are served from _registry_cache.
+        """
         try:
             import winreg
             # Common registry keys for IDA Pro
@@ -98,17 +210,15 @@ class IDADetector:
             ]
             
             for hkey, key_path in registry_keys:
-                try:
-                    with winreg.OpenKey(hkey, key_path) as key:
-                        # Try to get installation path
-                        try:
-                            install_path = winreg.QueryValueEx(key, "InstallDir")[0]
-                            if Path(install_path).exists():
-                                return install_path
-                        except FileNotFoundError:
-                            pass
-                except FileNotFoundError:
-                    continue
+                cache_key = (hkey, key_path)
+                if cache_key not in self._registry_cache:
+                    self._registry_cache[cache_key] = self._query_install_dir(
+                        winreg, hkey, key_path
+                    )
+                
+                install_path = self._registry_cache[cache_key]
+                if install_path:
+                    return install_path
         except ImportError:
             logger.debug("winreg not available (not Windows)")
         except Exception as e:
@@ -116,73 +226,159 @@ class IDADetector:
         
         return None
     
-    def _get_common_paths(self) -> list[Path]:
-        """Get common IDA Pro installation paths"""
-        paths = []
+    def _query_install_dir(self, winreg, hkey: int, key_path: str) -> Optional[str]:
+        """Read InstallDir from a registry key, if it names an existing directory"""
+        try:
+            with winreg.OpenKey(hkey, key_path) as key:
+                install_path = winreg.QueryValueEx(key, "InstallDir")[0]
+        except FileNotFoundError:
+            return None
+        
+        return install_path if os.path.isdir(install_path) else None
+    
+    def _get_candidate_parents(self) -> List[Tuple[Path, str]]:
+        """
+        Get directories that commonly contain an IDA Pro installation
         
+        Returns:
+            (parent directory, lowercase child-name prefix) pairs
+        """
         if sys.platform == "win32":
             # Windows common paths
             program_files = os.getenv("ProgramFiles", "C:\\Program Files")
             program_files_x86 = os.getenv("ProgramFiles(x86)", "C:\\Program Files (x86)")
             
-            paths.extend([
-                Path(program_files) / "IDA Pro",
-                Path(program_files) / "IDA Pro 8.0",
-                Path(program_files) / "IDA Pro 8.1",
-                Path(program_files) / "IDA Pro 8.2",
-                Path(program_files) / "IDA Pro 8.3",
-                Path(program_files_x86) / "IDA Pro",
-                Path(program_files_x86) / "IDA Pro 8.0",
-                Path(program_files_x86) / "IDA Pro 8.1",
-                Path(program_files_x86) / "IDA Pro 8.2",
-                Path(program_files_x86) / "IDA Pro 8.3",
-            ])
+            return [
+                (Path(program_files), "ida pro"),
+                (Path(program_files_x86), "ida pro"),
+            ]
         elif sys.platform == "darwin":
             # macOS common paths
-            paths.extend([
-                Path("/Applications/IDA Pro.app"),
-                Path.home() / "Applications" / "IDA Pro.app",
-            ])
+            return [
+                (Path("/Applications"), "ida pro"),
+                (Path.home() / "Applications", "ida pro"),
+            ]
         else:
             # Linux common paths
-            paths.extend([
-                Path("/opt/ida"),
-                Path("/usr/local/ida"),
-                Path.home() / "ida",
-            ])
+            return [
+                (Path("/opt"), "ida"),
+                (Path("/usr/local"), "ida"),
+                (Path.home(), "ida"),
+            ]
+    
+    def _iter_common_paths(self) -> Iterator[Path]:
+        """
+        Yield IDA Pro install directories from the common parent directories
         
-        return paths
+        ADR Note: One os.scandir per parent replaces a stat per hardcoded
+        candidate ("IDA Pro", "IDA Pro 8.0", ...), and also picks up
+        versions that were never hardcoded, e.g. "IDA Pro 9.0". A matching
+        name is only accepted if the directory holds an IDA executable, and
+        the newest version is tried first.
+        """
+        for parent, prefix in self._get_candidate_parents():
+            try:
+                with os.scandir(parent) as it:
+                    names = [
+                        entry.name for entry in it
+                        if entry.name.lower().startswith(prefix)
+                        and entry.is_dir()
+                    ]
+            except OSError:
+                continue
+            
+            for name in sorted(names, key=_version_key, reverse=True):
+                path = parent / name
+                if self._is_ida_install(path):
+                    yield path
     
-    def _check_python_module(self) -> bool:
-        """Check if idapython module is available"""
+    def _list_names(self, path: Path) -> Set[str]:
+        """List child names of a directory with a single scandir"""
         try:
-            import idaapi
-            return True
-        except ImportError:
-            return False
+            with os.scandir(path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+    
+    def _is_ida_install(self, path: Path) -> bool:
+        """
+        Check if path is an IDA Pro installation
+        
+        ADR Note: Executables are checked by membership in a single
+        directory listing, as in GhidraDetector._is_ghidra_install. macOS
+        app bundles keep them under Contents/MacOS.
+        """
+        if path.suffix.lower() == ".app":
+            path = path / "Contents" / "MacOS"
+        return not IDA_EXECUTABLES.isdisjoint(self._list_names(path))
+    
+    def is_running(self) -> bool:
+        """Check whether IDA Pro is running right now, ignoring the detect() memo"""
+        self._running_cache = None
+        return self._check_running_process()
     
     def _check_running_process(self) -> bool:
-        """Check if IDA Pro process is running"""
+        """
+        Check if IDA Pro process is running
+        
+        ADR Note: The result is memoized until the next detect() call, so
+        _create_result does not walk the process list a second time.
+        """
+        if self._running_cache is not None:
+            return self._running_cache
+        
+        running = False
         try:
-            import psutil
-            for proc in psutil.process_iter(['name']):
-                try:
-                    name = proc.info['name'].lower()
-                    if 'ida' in name and ('exe' in name or 'app' in name):
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            for name in self._iter_process_names():
+                if 'ida' in name and ('exe' in name or 'app' in name):
+                    running = True
+                    break
         except ImportError:
             logger.debug("psutil not available for process detection")
         except Exception as e:
             logger.debug(f"Process check failed: {e}")
         
-        return False
+        self._running_cache = running
+        return running
+    
+    def _iter_process_names(self) -> Iterator[str]:
+        """
+        Yield lowercase names of running processes
+        
+        ADR Note: On Linux names are read straight from /proc/<pid>/comm,
+        one read per pid, instead of building psutil Process objects.
+        Other platforms (or a missing /proc) fall back to psutil.
+        """
+        if sys.platform.startswith("linux"):
+            try:
+                entries = os.scandir("/proc")
+            except OSError:
+                entries = None
+            
+            if entries is not None:
+                with entries:
+                    for entry in entries:
+                        if not entry.name.isdigit():
+                            continue
+                        try:
+                            with open(f"/proc/{entry.name}/comm", "rb") as f:
+                                yield f.read().strip().decode('utf-8', 'replace').lower()
+                        except OSError:
+                            # Process exited or is inaccessible
+                            continue
+                return
+        
+        import psutil
+        for proc in psutil.process_iter(['name']):
+            try:
+                yield (proc.info['name'] or '').lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
     
     def _create_result(self, install_path: Path, detection_method: str) -> DetectionResult:
         """Create detection result with additional checks"""
         # Check if idapython is available
-        python_module_available = self._check_python_module()
+        python_module_available = _probe_ida_module()
         
         # Check if running
         is_running = self._check_running_process()
@@ -201,26 +397,52 @@ class IDADetector:
         )
     
     def _get_version(self, install_path: Path) -> Optional[str]:
-        """Try to determine IDA Pro version"""
-        # Check for version file or executable
-        ida_exe = install_path / "ida.exe"
-        ida64_exe = install_path / "ida64.exe"
+        """
+        Try to determine IDA Pro version
+        
+        ADR Note: The install directory is listed once and the executables
+        are found by membership, instead of up to four exists() stats.
+        Version metadata (macOS Info.plist, Windows version resource) is
+        read directly; running the executable with -v is the fallback.
+        """
+        try:
+            with os.scandir(install_path) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            return None
         
-        if ida_exe.exists() or ida64_exe.exists():
-            # Try to get version from executable
+        # macOS app bundle
+        if "Contents" in names:
             try:
-                import subprocess
-                exe = ida64_exe if ida64_exe.exists() else ida_exe
-                result = subprocess.run(
-                    [str(exe), "-v"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
+                with open(os.path.join(install_path, "Contents", "Info.plist"), "rb") as f:
+                    version = plistlib.load(f).get("CFBundleShortVersionString")
+                if version:
+                    return str(version)
             except Exception:
                 pass
         
+        # Prefer the 64-bit executable
+        exe_name = next((n for n in ("ida64.exe", "ida.exe") if n in names), None)
+        if exe_name is None:
+            return None
+        exe_path = os.path.join(install_path, exe_name)
+        
+        if sys.platform == "win32":
+            version = _read_file_version(exe_path)
+            if version:
+                return version
+        
+        # Try to get version from executable
+        try:
+            result = subprocess.run(
+                [exe_path, "-v"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                return result.stdout.strip()
+        except Exception:
+            pass
+        
         return None
-
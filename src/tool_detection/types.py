@@ -6,10 +6,15 @@ This allows detector implementations to import types without importing
 the main detector class.
 """
 
+import sys
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from typing import Optional, Dict, Any
 from pathlib import Path
-from pydantic import BaseModel
+
+# dataclass(slots=True) needs Python 3.10+. Explicit __slots__ cannot be
+# combined with field defaults, so older interpreters get plain dataclasses.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class ToolType(str, Enum):
@@ -19,12 +24,15 @@ class ToolType(str, Enum):
     NONE = "none"
 
 
-class DetectionResult(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class DetectionResult:
     """
     Result of tool detection
     
     ADR Note: Structured result allows easy inspection and debugging.
-    Includes all relevant information about detected tool.
+    Includes all relevant information about detected tool. Results are built
+    by trusted detector code only, so a slotted dataclass is used instead of
+    a validating model.
     """
     tool_type: ToolType
     is_available: bool
@@ -34,5 +42,21 @@ class DetectionResult(BaseModel):
     is_running: bool = False
     detection_method: Optional[str] = None  # How it was detected
     error_message: Optional[str] = None
-    metadata: Dict[str, Any] = {}  # Tool-specific metadata
+    metadata: Dict[str, Any] = field(default_factory=dict)  # Tool-specific metadata
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        data = asdict(self)
+        data["tool_type"] = self.tool_type.value
+        data["install_path"] = str(self.install_path) if self.install_path else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DetectionResult":
+        """Create from a dictionary produced by to_dict()"""
+        data = dict(data)
+        data["tool_type"] = ToolType(data["tool_type"])
+        if data.get("install_path"):
+            data["install_path"] = Path(data["install_path"])
+        return cls(**data)
 
@@ -7,9 +7,77 @@ IDA Pro's RPC server.
 """
 
 import json
+import base64
+import binascii
+import functools
 import http.client
+import socket
+import threading
 from urllib.parse import urlparse
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Iterator, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Responses larger than this are stream-parsed when ijson is available
+STREAM_THRESHOLD = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=65536)
+def format_address(address: int) -> str:
+    """
+    Format an address as the hex string IDA Pro RPC expects (e.g. "0x401000")
+    
+    ADR Note: Cached because bulk decompilation formats the same function
+    addresses repeatedly across passes.
+    """
+    return "0x" + format(address, "X")
+
+
+def _dumps(payload: Any) -> Union[bytes, str]:
+    """Serialize a request body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload)
+
+
+def _loads(raw: bytes) -> Any:
+    """
+    Parse a response body, using orjson when available
+    
+    ADR Note: orjson parses bytes directly, skipping the intermediate str
+    that stdlib json needs; large list_functions/decompile responses
+    dominate RPC CPU time otherwise.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode())
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket"""
+    
+    def __init__(self, socket_path: str):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+    
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
 
 
 class IDAProRPCClient:
@@ -19,6 +87,10 @@ class IDAProRPCClient:
     ADR Note: Connects to IDA Pro's RPC server (default port 13337).
     Uses JSON-RPC 2.0 protocol to communicate with IDA Pro plugin.
     This is the shared implementation used by adapters and tools.
+    A single keep-alive HTTP connection is reused across calls, so the
+    TCP handshake is paid once rather than per RPC. A "unix:///path/to.sock"
+    URL talks to a same-host server over a Unix domain socket instead,
+    bypassing the loopback TCP stack.
     """
     
     def __init__(self, rpc_url: str = "http://127.0.0.1:13337"):
@@ -26,13 +98,74 @@ class IDAProRPCClient:
         Initialize RPC client
         
         Args:
-            rpc_url: IDA Pro RPC server URL
+            rpc_url: IDA Pro RPC server URL (http://host:port or unix:///socket/path)
         """
         self.rpc_url = rpc_url
         parsed = urlparse(rpc_url)
+        self.socket_path: Optional[str] = parsed.path if parsed.scheme == "unix" else None
         self.host = parsed.hostname or "127.0.0.1"
         self.port = parsed.port or 13337
         self._request_id = 1
+        
+        # Persistent keep-alive connection, guarded for use across threads
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+    
+    def close(self):
+        """Close the persistent connection (reopened on the next call)"""
+        with self._lock:
+            self._reset_connection()
+    
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Open a connection using the transport selected by rpc_url"""
+        if self.socket_path:
+            return _UnixHTTPConnection(self.socket_path)
+        return http.client.HTTPConnection(self.host, self.port)
+    
+    def _reset_connection(self):
+        """Drop the current connection; caller must hold self._lock"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _post(self, body: Union[bytes, str]) -> Dict[str, Any]:
+        """
+        POST a JSON-RPC body over the persistent connection
+        
+        ADR Note: The server may drop an idle keep-alive connection between
+        calls. A failure on a reused connection is retried once on a fresh
+        one; a failure on a fresh connection is raised to the caller.
+        Caller must hold self._lock.
+        """
+        while True:
+            reused = self._conn is not None
+            if not reused:
+                self._conn = self._new_connection()
+            
+            try:
+                # POST to /mcp endpoint
+                self._conn.request("POST", "/mcp", body, {
+                    "Content-Type": "application/json",
+                    "Connection": "keep-alive"
+                })
+                response = self._conn.getresponse()
+                length = int(response.getheader("Content-Length") or 0)
+                if IJSON_AVAILABLE and length > STREAM_THRESHOLD:
+                    # Parse straight from the socket; no raw copy of the body
+                    data = next(ijson.items(response, "", use_float=True))
+                    response.read()
+                else:
+                    data = _loads(response.read())
+            except Exception as e:
+                self._reset_connection()
+                if reused and isinstance(e, (http.client.HTTPException, ConnectionError)):
+                    continue
+                raise
+            
+            if response.will_close:
+                self._reset_connection()
+            
+            return data
     
     def _call_rpc(self, method: str, params: Optional[List[Any]] = None) -> Any:
         """
@@ -41,54 +174,93 @@ class IDAProRPCClient:
         ADR Note: Standard JSON-RPC 2.0 protocol. IDA Pro plugin uses /mcp endpoint.
         Parameters are passed as a list (not dict) matching ida-pro-mcp format.
         """
-        # Build JSON-RPC request
+        return self._send(self._build_request(method, params))
+    
+    def batch_call(self, calls: List[Tuple[str, Optional[List[Any]]]]) -> List[Any]:
+        """
+        Make several JSON-RPC 2.0 calls in one batch request
+        
+        ADR Note: JSON-RPC 2.0 batches are a JSON array of requests posted
+        once, so N calls cost one round-trip instead of N. Responses may
+        arrive in any order and are matched back to calls by id. An error
+        in any call raises, as with _call_rpc.
+        
+        Args:
+            calls: (method, params) pairs
+        
+        Returns:
+            Results in the same order as calls
+        """
+        if not calls:
+            return []
+        return self._send([self._build_request(method, params) for method, params in calls])
+    
+    def _build_request(self, method: str, params: Optional[List[Any]]) -> Dict[str, Any]:
+        """Build a single JSON-RPC request object"""
+        with self._lock:
+            request_id = self._request_id
+            self._request_id += 1
+        
         payload = {
             "jsonrpc": "2.0",
             "method": method,
-            "id": self._request_id
+            "id": request_id
         }
-        self._request_id += 1
         
         # Parameters as list (not dict) - matching ida-pro-mcp format
         if params is not None:
             payload["params"] = params
         
-        # Create connection
-        conn = http.client.HTTPConnection(self.host, self.port)
-        
+        return payload
+    
+    def _send(self, payload: Any) -> Any:
+        """Send a request object or batch array and unwrap the result(s)"""
         try:
-            # POST to /mcp endpoint
-            conn.request("POST", "/mcp", json.dumps(payload), {
-                "Content-Type": "application/json"
-            })
-            response = conn.getresponse()
-            data = json.loads(response.read().decode())
+            with self._lock:
+                data = self._post(_dumps(payload))
             
-            if "error" in data:
-                error = data["error"]
-                code = error.get("code", -1)
-                message = error.get("message", "Unknown error")
-                error_msg = f"RPC Error {code}: {message}"
-                if "data" in error:
-                    error_msg += f"\n{error['data']}"
-                raise Exception(error_msg)
+            if not isinstance(payload, list):
+                return self._extract_result(data)
             
-            result = data.get("result")
-            # Handle empty responses
-            if result is None:
-                result = {}
+            if not isinstance(data, list):
+                # Batch rejected as a whole
+                self._extract_result(data)
+                raise Exception("Malformed batch response")
             
-            return result
+            responses = {item.get("id"): item for item in data}
+            results = []
+            for request in payload:
+                response = responses.get(request["id"])
+                if response is None:
+                    raise Exception(f"No response for request {request['id']} ({request['method']})")
+                results.append(self._extract_result(response))
+            return results
         
         except http.client.HTTPException as e:
             raise Exception(f"HTTP error: {e}")
         except ConnectionRefusedError:
-            raise Exception(f"Cannot connect to IDA Pro RPC server at {self.host}:{self.port}. "
+            raise Exception(f"Cannot connect to IDA Pro RPC server at {self.socket_path or f'{self.host}:{self.port}'}. "
                           "Make sure IDA Pro is running with the MCP plugin loaded.")
         except Exception as e:
             raise Exception(f"RPC call failed: {e}")
-        finally:
-            conn.close()
+    
+    def _extract_result(self, data: Dict[str, Any]) -> Any:
+        """Return the result of a JSON-RPC response, raising on error"""
+        if "error" in data:
+            error = data["error"]
+            code = error.get("code", -1)
+            message = error.get("message", "Unknown error")
+            error_msg = f"RPC Error {code}: {message}"
+            if "data" in error:
+                error_msg += f"\n{error['data']}"
+            raise Exception(error_msg)
+        
+        result = data.get("result")
+        # Handle empty responses
+        if result is None:
+            result = {}
+        
+        return result
     
     def check_connection(self) -> bool:
         """Check if IDA Pro RPC server is accessible"""
@@ -113,6 +285,50 @@ class IDAProRPCClient:
         """Get function by address"""
         return self._call_rpc("get_function_by_address", [address])
     
+    def iter_functions(
+        self,
+        offset: int = 0,
+        count: int = 0,
+        page_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate functions one at a time, fetching page_size per request
+        
+        ADR Note: list_functions(count=0) returns every function in one
+        response, which can be several MB. Paging keeps peak memory bounded
+        by page_size regardless of database size.
+        
+        Args:
+            offset: Offset to start listing from
+            count: Maximum number of functions to yield (0 means all)
+            page_size: Functions fetched per RPC call
+        """
+        remaining = count
+        while True:
+            request_count = min(page_size, remaining) if count else page_size
+            result = self.list_functions(offset, request_count)
+            items = result.get("data", result.get("items", [])) if isinstance(result, dict) else []
+            if not items:
+                return
+            
+            for item in items:
+                yield item
+                if count:
+                    remaining -= 1
+                    if remaining <= 0:
+                        return
+            
+            next_offset = result.get("next_offset")
+            if next_offset is None or next_offset <= offset:
+                return
+            offset = next_offset
+    
+    def list_functions_bulk(self, addresses: List[int]) -> List[Dict[str, Any]]:
+        """Get the functions at several addresses in one batch request"""
+        return self.batch_call([
+            ("get_function_by_address", [address]) for address in addresses
+        ])
+    
     def get_function_by_name(self, name: str) -> Dict[str, Any]:
         """Get function by name"""
         return self._call_rpc("get_function_by_name", [name])
@@ -126,8 +342,7 @@ class IDAProRPCClient:
         """
         if address is not None:
             # IDA Pro RPC expects hex string
-            addr_str = f"0x{address:X}"
-            params = [addr_str]
+            params = [format_address(address)]
         else:
             params = []
         result = self._call_rpc("decompile_function", params)
@@ -135,6 +350,16 @@ class IDAProRPCClient:
             return result
         return str(result) if result else ""
     
+    def decompile_functions(self, addresses: List[int]) -> List[str]:
+        """Decompile several functions in one batch request"""
+        results = self.batch_call([
+            ("decompile_function", [format_address(address)]) for address in addresses
+        ])
+        return [
+            result if isinstance(result, str) else (str(result) if result else "")
+            for result in results
+        ]
+    
     def get_xrefs_to(self, address: int) -> List[Dict[str, Any]]:
         """Get cross-references to address"""
         result = self._call_rpc("get_xrefs_to", [address])
@@ -143,15 +368,22 @@ class IDAProRPCClient:
         return []
     
     def read_memory_bytes(self, address: int, size: int) -> bytes:
-        """Read memory bytes"""
+        """
+        Read memory bytes
+        
+        ADR Note: The encoding is picked from the "0x" prefix up front
+        instead of attempting base64 and falling back on the exception.
+        Prefixed hex may be contiguous ("0x4889...") or per-byte
+        ("0x48 0x89 ..."); bytes.fromhex skips the whitespace.
+        """
         result = self._call_rpc("read_memory_bytes", [address, size])
         if isinstance(result, str):
-            # May be hex string or base64
-            import base64
-            try:
-                return base64.b64decode(result)
-            except:
-                # Try hex
+            if result.startswith("0x"):
                 return bytes.fromhex(result.replace("0x", ""))
+            try:
+                return base64.b64decode(result, validate=True)
+            except binascii.Error:
+                # Unprefixed hex
+                return bytes.fromhex(result)
         return result
 
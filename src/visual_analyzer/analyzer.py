@@ -5,9 +5,12 @@ ADR Note: Coordinates screen capture, change detection, and value extraction.
 Main entry point for visual analysis operations.
 """
 
+import itertools
 import logging
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 import numpy as np
@@ -33,11 +36,18 @@ class VisualAnalyzer:
     background thread for continuous monitoring or on-demand for single captures.
     """
     
+    # Upper bound on regions processed concurrently per monitoring tick
+    MAX_REGION_WORKERS = 4
+    
+    # Captured ticks buffered between the capture and analysis threads
+    FRAME_RING_SLOTS = 4
+    
     def __init__(
         self,
         change_threshold: float = 0.1,
         capture_interval: float = 0.1,
-        use_ocr: bool = False
+        use_ocr: bool = False,
+        downsample: int = 4
     ):
         """
         Initialize visual analyzer
@@ -46,18 +56,28 @@ class VisualAnalyzer:
             change_threshold: Change detection threshold (0.0-1.0)
             capture_interval: Time between captures (seconds)
             use_ocr: Enable OCR for text extraction
+            downsample: Factor frames are shrunk by (as grayscale) before
+                change detection; value extraction still sees full frames
         """
         self.screen_capture = ScreenCapture()
-        self.change_detector = ChangeDetector(threshold=change_threshold)
+        self.change_detector = ChangeDetector(threshold=change_threshold, scale=downsample)
         self.value_extractor = ValueExtractor(use_ocr=use_ocr)
         
         self.capture_interval = capture_interval
         self.monitoring = False
         self.monitoring_thread: Optional[threading.Thread] = None
+        self.analysis_thread: Optional[threading.Thread] = None
+        
+        # Bounded capture -> analysis ring of (timestamp, frames, buffers) ticks
+        self._frame_ring: deque = deque(maxlen=self.FRAME_RING_SLOTS)
+        self._frame_ready = threading.Condition()
+        # Per-region frame buffer sets returned by analysis for reuse
+        self._free_buffers: List[List[np.ndarray]] = []
         
         self.monitoring_regions: List[Dict[str, Any]] = []
-        self.detected_changes: List[Dict[str, Any]] = []
+        # Recent changes; the deque evicts the oldest entry in O(1)
         self.max_changes_history = 100
+        self.detected_changes: deque = deque(maxlen=self.max_changes_history)
     
     def start_monitoring(
         self,
@@ -82,44 +102,140 @@ class VisualAnalyzer:
         self.monitoring_regions = regions
         self.monitoring = True
         
-        def monitor_loop():
-            while self.monitoring:
+        # Each region keeps its own previous frame; the first reuses the
+        # analyzer's detector so single-region behaviour is unchanged
+        detectors = [self.change_detector] + [
+            ChangeDetector(
+                threshold=self.change_detector.threshold,
+                scale=self.change_detector.scale
+            )
+            for _ in regions[1:]
+        ]
+        
+        with self._frame_ready:
+            self._frame_ring.clear()
+            self._free_buffers.clear()
+        
+        self.monitoring_thread = threading.Thread(
+            target=self._capture_loop, args=(regions,), daemon=True
+        )
+        self.analysis_thread = threading.Thread(
+            target=self._analysis_loop, args=(regions, detectors, callback), daemon=True
+        )
+        self.analysis_thread.start()
+        self.monitoring_thread.start()
+        
+        logger.info(f"Started monitoring {len(regions)} regions")
+        return True
+    
+    def _capture_loop(self, regions: List[Dict[str, Any]]):
+        """
+        Producer: capture all regions once per capture interval
+        
+        ADR Note: Capture runs on its own thread so the capture cadence does
+        not stretch when analysis is slow. Ticks go into a bounded ring;
+        when analysis falls behind, the oldest tick is dropped rather than
+        queueing stale frames. Frames are grabbed sequentially here because
+        mss instances are not shared across threads.
+        
+        Frames are written into per-region buffers that cycle through a free
+        list, so at most FRAME_RING_SLOTS + 2 buffer sets ever exist and a
+        buffer is never overwritten while analysis still holds it.
+        """
+        while self.monitoring:
+            try:
+                with self._frame_ready:
+                    buffers = self._free_buffers.pop() if self._free_buffers else None
+                if buffers is None:
+                    buffers = [
+                        np.empty((region["h"], region["w"], 3), dtype=np.uint8)
+                        for region in regions
+                    ]
+                
+                frames = [
+                    self.screen_capture.capture_region_into(
+                        region["x"], region["y"], region["w"], region["h"], out
+                    )
+                    for region, out in zip(regions, buffers)
+                ]
+                
+                with self._frame_ready:
+                    if len(self._frame_ring) == self._frame_ring.maxlen:
+                        logger.debug("Analysis behind capture, dropping oldest frames")
+                        self._free_buffers.append(self._frame_ring.popleft()[2])
+                    self._frame_ring.append((time.time(), frames, buffers))
+                    self._frame_ready.notify()
+            
+            except Exception as e:
+                logger.error(f"Error in capture loop: {e}")
+            
+            time.sleep(self.capture_interval)
+    
+    def _analysis_loop(
+        self,
+        regions: List[Dict[str, Any]],
+        detectors: List[ChangeDetector],
+        callback: Optional[callable]
+    ):
+        """
+        Consumer: analyze captured ticks in order
+        
+        ADR Note: Change detection and value extraction run concurrently per
+        region. OpenCV and numpy release the GIL, so a tick costs roughly
+        the slowest region rather than the sum of all regions.
+        """
+        executor = None
+        if len(regions) > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=min(len(regions), self.MAX_REGION_WORKERS),
+                thread_name_prefix="region"
+            )
+        
+        try:
+            while True:
+                with self._frame_ready:
+                    while self.monitoring and not self._frame_ring:
+                        self._frame_ready.wait()
+                    if not self.monitoring:
+                        return
+                    captured_at, frames, buffers = self._frame_ring.popleft()
+                
                 try:
-                    for region in self.monitoring_regions:
-                        result = self.analyze_region(
-                            region["x"],
-                            region["y"],
-                            region["w"],
-                            region["h"],
-                            region.get("name", "unknown")
-                        )
-                        
+                    jobs = [
+                        (frame, region, detector, captured_at)
+                        for frame, region, detector in zip(frames, regions, detectors)
+                    ]
+                    if executor:
+                        results = list(executor.map(lambda job: self._analyze_frame(*job), jobs))
+                    else:
+                        results = [self._analyze_frame(*job) for job in jobs]
+                    
+                    for result in results:
                         if result.get("changed") and callback:
                             callback(result)
                         
                         if result.get("changed"):
                             self.detected_changes.append(result)
-                            # Keep only recent changes
-                            if len(self.detected_changes) > self.max_changes_history:
-                                self.detected_changes.pop(0)
-                    
-                    time.sleep(self.capture_interval)
                 
                 except Exception as e:
-                    logger.error(f"Error in monitoring loop: {e}")
-                    time.sleep(self.capture_interval)
-        
-        self.monitoring_thread = threading.Thread(target=monitor_loop, daemon=True)
-        self.monitoring_thread.start()
-        
-        logger.info(f"Started monitoring {len(regions)} regions")
-        return True
+                    logger.error(f"Error in analysis loop: {e}")
+                
+                with self._frame_ready:
+                    self._free_buffers.append(buffers)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
     
     def stop_monitoring(self):
         """Stop continuous monitoring"""
         self.monitoring = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=2.0)
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        for thread in (self.monitoring_thread, self.analysis_thread):
+            if thread:
+                thread.join(timeout=2.0)
+        with self._frame_ready:
+            self._frame_ring.clear()
         self.change_detector.reset()
         logger.info("Stopped monitoring")
     
@@ -151,6 +267,20 @@ class VisualAnalyzer:
         """
         # Capture region
         frame = self.screen_capture.capture_region(x, y, width, height)
+        region = {"x": x, "y": y, "w": width, "h": height, "name": region_name}
+        return self._analyze_frame(frame, region, self.change_detector)
+    
+    def _analyze_frame(
+        self,
+        frame: Optional[np.ndarray],
+        region: Dict[str, Any],
+        change_detector: ChangeDetector,
+        captured_at: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run change detection and value extraction on a captured frame"""
+        region_name = region.get("name", "unknown")
+        x, y, width, height = region["x"], region["y"], region["w"], region["h"]
+        
         if frame is None:
             return {
                 "region_name": region_name,
@@ -159,7 +289,7 @@ class VisualAnalyzer:
             }
         
         # Detect changes
-        change_info = self.change_detector.detect_changes(frame)
+        change_info = change_detector.detect_changes(frame)
         
         # Extract value if changed
         extracted_value = None
@@ -173,36 +303,40 @@ class VisualAnalyzer:
             "change_percentage": change_info.get("change_percentage", 0.0),
             "changed_regions": change_info.get("changed_regions", []),
             "extracted_value": extracted_value,
-            "timestamp": time.time()
+            "timestamp": captured_at or time.time()
         }
         
         return result
     
     def get_detected_changes(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get list of detected changes"""
-        changes = self.detected_changes
         if limit:
-            changes = changes[-limit:]
-        return changes
+            start = max(len(self.detected_changes) - limit, 0)
+            return list(itertools.islice(self.detected_changes, start, None))
+        return list(self.detected_changes)
     
     def clear_history(self):
         """Clear detected changes history"""
-        self.detected_changes = []
+        self.detected_changes.clear()
     
     def capture_process_window(
         self,
         process_name: Optional[str] = None,
-        process_id: Optional[int] = None
+        process_id: Optional[int] = None,
+        image_format: str = "png"
     ) -> Optional[Dict[str, Any]]:
         """
         Capture full window of a process
         
         ADR Note: Captures the entire window of a target process.
-        Returns screenshot and window information.
+        Returns screenshot and window information. In-process consumers
+        can ask for "raw" to get the BGRA ndarray under "screenshot" and
+        skip image encoding and base64 entirely.
         
         Args:
             process_name: Process name (e.g., "game.exe")
             process_id: Process ID (PID)
+            image_format: "png", "jpeg", or "raw"
         
         Returns:
             Dictionary with screenshot data and window info, or None on error
@@ -215,17 +349,23 @@ class VisualAnalyzer:
         if screenshot is None:
             return None
         
-        # Convert to base64 for transmission
-        screenshot_base64 = self.screen_capture.screenshot_to_base64(screenshot)
-        
-        return {
-            "screenshot_base64": screenshot_base64,
+        result = {
             "width": screenshot.shape[1],
             "height": screenshot.shape[0],
             "process_name": process_name,
             "process_id": process_id,
-            "format": "png"
+            "format": image_format
         }
+        
+        if image_format == "raw":
+            result["screenshot"] = screenshot
+        else:
+            # Convert to base64 for transmission
+            result["screenshot_base64"] = self.screen_capture.screenshot_to_base64(
+                screenshot, image_format
+            )
+        
+        return result
     
     def save_screenshot(self, image: np.ndarray, path: Path) -> bool:
         """Save screenshot to file"""
@@ -235,19 +375,25 @@ class VisualAnalyzer:
         self,
         screenshot_base64: Optional[str] = None,
         image: Optional[np.ndarray] = None,
-        window_name: str = "Select Region - Click and drag, then press SPACE or ENTER"
+        window_name: str = "Select Region - Click and drag, then press SPACE or ENTER",
+        decode_scale: int = 1
     ) -> Optional[Dict[str, Any]]:
         """
         Interactively select a region from a screenshot
         
         ADR Note: Uses OpenCV's selectROI to display image and allow user to
         drag a rectangle to select region. This is more user-friendly than
-        manually entering coordinates.
+        manually entering coordinates. In-process callers should pass the
+        ndarray as image; the base64 path costs an encode/decode round-trip
+        and is meant for screenshots arriving over MCP. There, decode_scale
+        lets libpng/libjpeg decode straight to 1/2, 1/4 or 1/8 size, and
+        the selected rectangle is scaled back to full-resolution coordinates.
         
         Args:
             screenshot_base64: Base64-encoded screenshot (alternative to image)
             image: NumPy array image (alternative to screenshot_base64)
             window_name: Name of the selection window
+            decode_scale: Reduce a base64 screenshot by 1, 2, 4 or 8 when decoding
         
         Returns:
             Dictionary with selected region coordinates, or None if cancelled
@@ -260,13 +406,21 @@ class VisualAnalyzer:
         import base64
         
         # Get image from either source
+        scale = 1
         if image is not None:
-            img = image.copy()
+            # selectROI only reads the image, no defensive copy needed
+            img = image
         elif screenshot_base64:
+            decode_flags = {
+                2: cv2.IMREAD_REDUCED_COLOR_2,
+                4: cv2.IMREAD_REDUCED_COLOR_4,
+                8: cv2.IMREAD_REDUCED_COLOR_8,
+            }
+            scale = decode_scale if decode_scale in decode_flags else 1
             try:
                 img_data = base64.b64decode(screenshot_base64)
                 nparr = np.frombuffer(img_data, np.uint8)
-                img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                img = cv2.imdecode(nparr, decode_flags.get(scale, cv2.IMREAD_COLOR))
                 if img is None:
                     logger.error("Failed to decode screenshot")
                     return None
@@ -293,10 +447,10 @@ class VisualAnalyzer:
             cv2.destroyAllWindows()
             
             return {
-                "x": int(x),
-                "y": int(y),
-                "width": int(width),
-                "height": int(height),
+                "x": int(x) * scale,
+                "y": int(y) * scale,
+                "width": int(width) * scale,
+                "height": int(height) * scale,
                 "region_name": "interactive_selection",
                 "ready_for_monitoring": True
             }
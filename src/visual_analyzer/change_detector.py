@@ -6,7 +6,8 @@ frame difference and other image processing techniques.
 """
 
 import logging
-from typing import Optional, Dict, List, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, List, Sequence, Tuple
 import numpy as np
 
 try:
@@ -16,9 +17,49 @@ except ImportError:
     CV2_AVAILABLE = False
     logging.warning("opencv-python not available")
 
+from .screen_capture import XXHASH_AVAILABLE, frame_digest
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _cached_color_bounds(
+    target_color: Tuple[int, ...],
+    tolerance: int,
+    channels: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    tc = np.asarray(target_color[:3], dtype=np.int16)
+    lower = np.clip(tc - tolerance, 0, 255).astype(np.uint8)
+    upper = np.clip(tc + tolerance, 0, 255).astype(np.uint8)
+    if channels == 4:
+        # Any alpha: lets inRange run on raw BGRA frames
+        lower = np.append(lower, np.uint8(0))
+        upper = np.append(upper, np.uint8(255))
+    # Shared between callers through the cache
+    lower.flags.writeable = False
+    upper.flags.writeable = False
+    return lower, upper
+
+
+def color_bounds(
+    target_color: Sequence[int],
+    tolerance: int,
+    channels: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    cv2.inRange lower/upper bounds for a color +/- tolerance, clipped to 0-255
+    
+    ADR Note: Monitoring loops match the same few target colors every frame;
+    bounds are built once with np.clip and served from an lru_cache instead
+    of rebuilding them with per-channel Python loops on every call. With
+    channels=4 the alpha bound spans 0-255, so BGRA captures are matched
+    as-is instead of being sliced or converted to BGR first.
+    """
+    if not isinstance(target_color, tuple):
+        target_color = tuple(target_color)
+    return _cached_color_bounds(target_color, tolerance, channels)
+
+
 class ChangeDetector:
     """
     Detects changes between consecutive frames
@@ -27,20 +68,111 @@ class ChangeDetector:
     template matching, color detection, and other methods.
     """
     
-    def __init__(self, threshold: float = 0.1, min_change_area: int = 100):
+    # Per-pixel grayscale delta (0-255) that counts as a change
+    DIFF_THRESHOLD = 30
+    
+    # Template matching pyramid: max pyrDown levels, smallest template side
+    # worth matching at a coarse level, score slack for coarse candidates,
+    # and search padding (pixels) around each candidate when refining
+    PYRAMID_LEVELS = 2
+    PYRAMID_MIN_TEMPLATE = 8
+    PYRAMID_RELAX = 0.1
+    PYRAMID_PAD = 2
+    TEMPLATE_CACHE_SIZE = 8
+    
+    # template_match methods: name -> OpenCV mode (all normalized)
+    MATCH_METHODS = {
+        "ccoeff": "TM_CCOEFF_NORMED",
+        "sqdiff": "TM_SQDIFF_NORMED",
+        "ccorr": "TM_CCORR_NORMED",
+    }
+    # Template grayscale std-dev below which it counts as flat
+    FLAT_TEMPLATE_STD = 1.0
+    
+    def __init__(self, threshold: float = 0.1, min_change_area: int = 100, scale: int = 4):
         """
         Initialize change detector
         
         Args:
             threshold: Change threshold (0.0-1.0), lower = more sensitive
             min_change_area: Minimum area of changed pixels to report
+            scale: Downscale factor applied before diffing (1 = full resolution)
         """
         if not CV2_AVAILABLE:
             raise ImportError("opencv-python not installed. Install with: pip install opencv-python")
         
         self.threshold = threshold
         self.min_change_area = min_change_area
+        self.scale = max(1, int(scale))
+        # Stored reduced (grayscale, downscaled) copy of the last frame
         self.previous_frame: Optional[np.ndarray] = None
+        
+        # Preallocated uint8 working buffers, (re)allocated lazily per shape.
+        # _gray_cur/_gray_prev are swapped by reference after every frame.
+        self._gray_full: Optional[np.ndarray] = None
+        self._gray_cur: Optional[np.ndarray] = None
+        self._gray_prev: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._thresh: Optional[np.ndarray] = None
+        # frame_digest of the frame stored as previous_frame
+        self._prev_digest: Optional[Tuple] = None
+        # Changed-pixel count that trips threshold, for (threshold, mask size)
+        self._abs_threshold = 0
+        self._abs_threshold_key: Optional[Tuple[float, int]] = None
+        
+        # id(template) -> (template, grayscale pyramid); the template is held
+        # so its id cannot be reused while cached
+        self._template_pyramids: Dict[int, Tuple[np.ndarray, List[np.ndarray]]] = {}
+        self._close_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Return the named working buffer, allocating it on first use or shape change"""
+        buf = getattr(self, name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            setattr(self, name, buf)
+        return buf
+    
+    def _reduce(self, frame: np.ndarray, name: str = "_gray_cur") -> np.ndarray:
+        """
+        Convert a frame to the grayscale, downscaled form used for diffing
+        
+        ADR Note: Change detection does not need color or full resolution.
+        Diffing a 1/scale grayscale image moves 3 * scale^2 times fewer
+        bytes, and only the reduced frame is kept as the previous frame.
+        Frames are saturated to uint8 so absdiff/threshold never run on
+        wider (e.g. float32) pixels. Conversion and resize write into
+        preallocated buffers (dst=), so steady-state monitoring does not
+        allocate per frame.
+        
+        Args:
+            frame: BGR, BGRA or grayscale frame
+            name: Working buffer that receives the reduced frame
+        """
+        if frame.dtype != np.uint8:
+            frame = cv2.convertScaleAbs(frame)
+        
+        height, width = frame.shape[:2]
+        if self.scale > 1:
+            size = (max(1, width // self.scale), max(1, height // self.scale))
+        else:
+            size = (width, height)
+        out = self._buffer(name, (size[1], size[0]))
+        
+        if self.scale > 1:
+            gray = self._buffer("_gray_full", (height, width)) if frame.ndim == 3 else frame
+        else:
+            gray = out
+        
+        if frame.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            cv2.cvtColor(frame, code, dst=gray)
+        elif gray is out:
+            np.copyto(out, frame)
+        
+        if self.scale > 1:
+            cv2.resize(gray, size, dst=out, interpolation=cv2.INTER_AREA)
+        return out
     
     def detect_changes(
         self,
@@ -51,7 +183,7 @@ class ChangeDetector:
         Detect changes between frames
         
         Args:
-            current_frame: Current frame (BGR numpy array)
+            current_frame: Current frame (BGR or BGRA numpy array)
             previous_frame: Previous frame (None to use stored)
         
         Returns:
@@ -59,16 +191,41 @@ class ChangeDetector:
             {
                 "changed": bool,
                 "change_percentage": float,
-                "changed_regions": [(x, y, w, h), ...],
-                "change_mask": np.ndarray
+                "changed_regions": [(x, y, w, h), ...],  # full-resolution coordinates
+                "change_mask": np.ndarray  # at 1/scale resolution, reused by the next call
             }
+        
+        ADR Note: Idle UIs produce long runs of pixel-identical frames. With
+        xxhash installed, a frame digest is compared with the previous
+        frame's before any image processing; on a match the result is
+        "unchanged" with change_mask None, skipping grayscale, diff and
+        region extraction entirely. xxh3 hashes a 1080p BGRA frame in under
+        1ms; the stdlib hashes take 5-20ms, more than the downscaled diff
+        itself, so without xxhash the check is skipped.
         """
-        if previous_frame is None:
-            previous_frame = self.previous_frame
+        digest = frame_digest(current_frame) if XXHASH_AVAILABLE else None
+        if (digest is not None
+                and previous_frame is None
+                and self.previous_frame is not None
+                and digest == self._prev_digest):
+            return {
+                "changed": False,
+                "change_percentage": 0.0,
+                "changed_regions": [],
+                "change_mask": None
+            }
+        self._prev_digest = digest
+        
+        gray_current = self._reduce(current_frame, "_gray_cur")
         
         if previous_frame is None:
+            gray_previous = self.previous_frame
+        else:
+            gray_previous = self._reduce(previous_frame, "_gray_prev")
+        
+        if gray_previous is None:
             # First frame, no comparison
-            self.previous_frame = current_frame.copy()
+            self._store_previous()
             return {
                 "changed": False,
                 "change_percentage": 0.0,
@@ -77,46 +234,68 @@ class ChangeDetector:
             }
         
         # Ensure frames are same size
-        if current_frame.shape != previous_frame.shape:
+        if gray_current.shape != gray_previous.shape:
             logger.warning("Frame size mismatch, resizing previous frame")
-            previous_frame = cv2.resize(previous_frame, (current_frame.shape[1], current_frame.shape[0]))
-        
-        # Convert to grayscale for comparison
-        gray_current = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
-        gray_previous = cv2.cvtColor(previous_frame, cv2.COLOR_BGR2GRAY)
+            gray_previous = cv2.resize(gray_previous, (gray_current.shape[1], gray_current.shape[0]))
         
+        thresh = self._buffer("_thresh", gray_current.shape)
         # Calculate absolute difference
-        diff = cv2.absdiff(gray_current, gray_previous)
+        diff = self._buffer("_diff", gray_current.shape)
+        cv2.absdiff(gray_current, gray_previous, dst=diff)
         
         # Apply threshold
-        _, thresh = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+        cv2.threshold(diff, self.DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=thresh)
+        
+        # ADR Note: countNonZero is a single vectorized pass over the mask;
+        # np.sum(thresh > 0) allocated a full-frame boolean array first
+        changed_pixels = cv2.countNonZero(thresh)
         
-        # Calculate change percentage
+        # Compare integer pixel counts; count/total > threshold is equivalent
+        # to count > floor(threshold * total), recomputed only on size/threshold change
         total_pixels = thresh.size
-        changed_pixels = np.sum(thresh > 0)
+        if self._abs_threshold_key != (self.threshold, total_pixels):
+            self._abs_threshold = int(self.threshold * total_pixels)
+            self._abs_threshold_key = (self.threshold, total_pixels)
+        changed = changed_pixels > self._abs_threshold
         change_percentage = changed_pixels / total_pixels
         
-        # Find changed regions (contours)
+        # Find changed regions (blobs), scaled back to full resolution
         changed_regions = []
-        if change_percentage > self.threshold:
-            contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area >= self.min_change_area:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    changed_regions.append((x, y, w, h))
+        if changed:
+            changed_regions = self._component_boxes(thresh, self.scale)
         
         # Update stored frame
-        self.previous_frame = current_frame.copy()
+        self._store_previous()
         
         return {
-            "changed": change_percentage > self.threshold,
+            "changed": changed,
             "change_percentage": float(change_percentage),
             "changed_regions": changed_regions,
             "change_mask": thresh
         }
     
+    def _component_boxes(self, mask: np.ndarray, scale: int = 1) -> List[Tuple[int, int, int, int]]:
+        """
+        Bounding boxes of mask blobs covering at least min_change_area pixels
+        
+        ADR Note: connectedComponentsWithStats returns every blob's area and
+        bounding box from one C call, replacing a Python loop of
+        contourArea/boundingRect over findContours output. Areas are pixel
+        counts; mask coordinates are multiplied back up by scale.
+        """
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        stats = stats[1:]  # label 0 is the background
+        keep = stats[:, cv2.CC_STAT_AREA] * (scale * scale) >= self.min_change_area
+        boxes = stats[keep][:, [cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT]]
+        if scale != 1:
+            boxes = boxes * scale
+        return list(map(tuple, boxes.tolist()))
+    
+    def _store_previous(self):
+        """Keep the current reduced frame as previous by swapping buffers (no copy)"""
+        self._gray_cur, self._gray_prev = self._gray_prev, self._gray_cur
+        self.previous_frame = self._gray_prev
+    
     def detect_color_change(
         self,
         current_frame: np.ndarray,
@@ -138,20 +317,12 @@ class ChangeDetector:
             Dictionary with color change information
         """
         # Create color mask
-        lower = np.array([max(0, c - tolerance) for c in target_color])
-        upper = np.array([min(255, c + tolerance) for c in target_color])
+        lower, upper = color_bounds(target_color, tolerance, current_frame.shape[2])
         
         mask = cv2.inRange(current_frame, lower, upper)
         
         # Find regions with target color
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        regions = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area >= self.min_change_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                regions.append((x, y, w, h))
+        regions = self._component_boxes(mask)
         
         return {
             "found": len(regions) > 0,
@@ -163,36 +334,198 @@ class ChangeDetector:
         self,
         current_frame: np.ndarray,
         template: np.ndarray,
-        threshold: float = 0.8
-    ) -> List[Tuple[int, int]]:
+        threshold: float = 0.8,
+        peaks_only: bool = False,
+        method: str = "auto"
+    ) -> np.ndarray:
         """
         Find template in current frame
         
         ADR Note: Template matching for finding specific UI elements.
+        Locations are returned as one int array built in a single vectorized
+        step; a low threshold can yield millions of hits, which a per-point
+        tuple loop turned into the dominant cost.
         
         Args:
             current_frame: Current frame
             template: Template image to find
             threshold: Match threshold (0.0-1.0)
+            peaks_only: Keep only 3x3 local score maxima, dropping the clump
+                of near-duplicate hits around each match
+            method: "ccoeff", "sqdiff", "ccorr", or "auto" (sqdiff for flat,
+                single-color templates, ccoeff otherwise)
         
         Returns:
-            List of (x, y) coordinates where template was found
+            Array of shape (N, 2) with one (x, y) row per location, row-major order
         """
         # Convert to grayscale
-        gray_frame = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
-        gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY) if len(template.shape) == 3 else template
+        code = cv2.COLOR_BGRA2GRAY if current_frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        gray_frame = cv2.cvtColor(current_frame, code)
+        template_pyr = self._template_pyramid(template)
+        mode = self._match_mode(template_pyr[0], method)
         
-        # Template matching
-        result = cv2.matchTemplate(gray_frame, gray_template, cv2.TM_CCOEFF_NORMED)
-        locations = np.where(result >= threshold)
+        # Build only as many frame levels as the template pyramid has
+        frame_pyr = [gray_frame]
+        for level_template in template_pyr[1:]:
+            reduced = cv2.pyrDown(frame_pyr[-1])
+            if (reduced.shape[0] < level_template.shape[0]
+                    or reduced.shape[1] < level_template.shape[1]):
+                break
+            frame_pyr.append(reduced)
+        
+        if len(frame_pyr) == 1:
+            # Template too small to downscale: plain full-resolution match
+            result = self._match_scores(gray_frame, template_pyr[0], mode)
+            ys, xs = self._hits(result, threshold, peaks_only)
+            return np.stack([xs, ys], axis=1)
+        
+        return self._match_pyramid(
+            frame_pyr, template_pyr[:len(frame_pyr)], threshold, peaks_only, mode
+        )
+    
+    def _match_mode(self, gray_template: np.ndarray, method: str) -> int:
+        """
+        OpenCV matchTemplate mode for a template_match method name
+        
+        ADR Note: TM_CCOEFF_NORMED subtracts the template mean, so a
+        single-color template has zero variance and scores ~1 everywhere;
+        TM_SQDIFF_NORMED needs no mean subtraction and is well defined (and
+        slightly cheaper) there. Textured templates keep CCOEFF, whose
+        threshold is far more selective than SQDIFF's on real frames.
+        """
+        if method == "auto":
+            _, std = cv2.meanStdDev(gray_template)
+            method = "sqdiff" if float(std[0][0]) < self.FLAT_TEMPLATE_STD else "ccoeff"
+        if method not in self.MATCH_METHODS:
+            raise ValueError(f"Unknown template match method: {method}")
+        return getattr(cv2, self.MATCH_METHODS[method])
+    
+    @staticmethod
+    def _match_scores(image: np.ndarray, template: np.ndarray, mode: int) -> np.ndarray:
+        """matchTemplate scores as similarity (higher is better) for every mode"""
+        result = cv2.matchTemplate(image, template, mode)
+        if mode == cv2.TM_SQDIFF_NORMED:
+            np.subtract(1.0, result, out=result)
+        return result
+    
+    def _hits(
+        self,
+        result: np.ndarray,
+        min_score: float,
+        peaks_only: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(ys, xs) of matchTemplate scores >= min_score, optionally local maxima only"""
+        hits = result >= min_score
+        if peaks_only:
+            hits &= result >= cv2.dilate(result, self._close_kernel)
+        return np.nonzero(hits)
+    
+    def _template_pyramid(self, template: np.ndarray) -> List[np.ndarray]:
+        """
+        Grayscale pyramid of a template, cached by template identity
+        
+        ADR Note: Callers match the same UI icon every frame; the template
+        is converted and pyrDown'ed once. Levels stop before the template's
+        smaller side drops under PYRAMID_MIN_TEMPLATE pixels.
+        """
+        cached = self._template_pyramids.get(id(template))
+        if cached is not None and cached[0] is template:
+            return cached[1]
+        
+        if template.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if template.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            gray_template = cv2.cvtColor(template, code)
+        else:
+            gray_template = template
+        
+        pyramid = [gray_template]
+        while len(pyramid) <= self.PYRAMID_LEVELS:
+            height, width = pyramid[-1].shape[:2]
+            if min(height, width) // 2 < self.PYRAMID_MIN_TEMPLATE:
+                break
+            pyramid.append(cv2.pyrDown(pyramid[-1]))
+        
+        if len(self._template_pyramids) >= self.TEMPLATE_CACHE_SIZE:
+            self._template_pyramids.pop(next(iter(self._template_pyramids)))
+        self._template_pyramids[id(template)] = (template, pyramid)
+        return pyramid
+    
+    def _match_pyramid(
+        self,
+        frame_pyr: List[np.ndarray],
+        template_pyr: List[np.ndarray],
+        threshold: float,
+        peaks_only: bool = False,
+        mode: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Coarse-to-fine template matching
+        
+        ADR Note: matchTemplate runs over the whole frame only at the
+        coarsest level, against a relaxed threshold. Candidate pixels are
+        merged (3x3 square close + connected components) into boxes, and
+        each box is re-matched at the next finer level inside a small ROI
+        around its upscaled position. Only the full-resolution pass applies
+        the caller's threshold, so reported locations match a full-frame
+        search wherever the coarse level found a candidate.
+        """
+        relaxed = threshold - self.PYRAMID_RELAX
+        top = len(frame_pyr) - 1
+        if mode is None:
+            mode = cv2.TM_CCOEFF_NORMED
+        
+        result = self._match_scores(frame_pyr[top], template_pyr[top], mode)
+        candidates = (result >= relaxed).astype(np.uint8)
+        candidates = cv2.morphologyEx(candidates, cv2.MORPH_CLOSE, self._close_kernel)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(candidates)
+        boxes = [tuple(int(v) for v in stats[i, :4]) for i in range(1, count)]
+        
+        pad = self.PYRAMID_PAD
+        width = frame_pyr[0].shape[1]
+        keys = []
+        for level in range(top - 1, -1, -1):
+            frame = frame_pyr[level]
+            level_template = template_pyr[level]
+            t_height, t_width = level_template.shape[:2]
+            # Last valid top-left corner at this level
+            max_x = frame.shape[1] - t_width
+            max_y = frame.shape[0] - t_height
+            min_score = threshold if level == 0 else relaxed
+            
+            next_boxes = []
+            for bx, by, bw, bh in boxes:
+                x0 = max(0, bx * 2 - pad)
+                y0 = max(0, by * 2 - pad)
+                x1 = min(max_x, (bx + bw) * 2 + pad)
+                y1 = min(max_y, (by + bh) * 2 + pad)
+                if x1 < x0 or y1 < y0:
+                    continue
+                
+                roi = frame[y0:y1 + t_height, x0:x1 + t_width]
+                roi_result = self._match_scores(roi, level_template, mode)
+                ys, xs = self._hits(roi_result, min_score, peaks_only and level == 0)
+                if len(xs) == 0:
+                    continue
+                
+                if level == 0:
+                    # Row-major pixel index, used to merge overlapping ROIs
+                    keys.append((ys + y0) * width + (xs + x0))
+                else:
+                    next_boxes.append((
+                        x0 + int(xs.min()), y0 + int(ys.min()),
+                        int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1
+                    ))
+            boxes = next_boxes
         
-        matches = []
-        for pt in zip(*locations[::-1]):  # Switch x and y
-            matches.append(pt)
+        if not keys:
+            return np.empty((0, 2), dtype=np.int64)
         
-        return matches
+        # Deduplicated, in row-major order as np.where over the full result would give
+        merged = np.unique(np.concatenate(keys))
+        return np.stack([merged % width, merged // width], axis=1)
     
     def reset(self):
         """Reset detector state"""
         self.previous_frame = None
+        self._prev_digest = None
 
@@ -5,13 +5,17 @@ ADR Note: Uses mss for fast, cross-platform screen capture.
 Captures specific regions or full windows of target applications.
 """
 
+import hashlib
 import logging
-from typing import Optional, Dict, Tuple
+import threading
+import time
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 import numpy as np
 
 try:
     import mss
+    import mss.tools
     MSS_AVAILABLE = True
 except ImportError:
     MSS_AVAILABLE = False
@@ -24,9 +28,32 @@ except ImportError:
     CV2_AVAILABLE = False
     logging.warning("opencv-python not available. Install with: pip install opencv-python")
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def frame_digest(image: np.ndarray) -> Tuple:
+    """
+    Cheap identity key for a frame's pixels
+    
+    ADR Note: xxh3 hashes well above memory bandwidth, so comparing keys
+    costs less than a single cvtColor; blake2b is the stdlib fallback.
+    Shape and dtype are part of the key so equal bytes in a different
+    layout never compare equal.
+    """
+    data = np.ascontiguousarray(image)
+    if XXHASH_AVAILABLE:
+        digest = xxhash.xxh3_64_intdigest(data)
+    else:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+    return (data.shape, data.dtype.str, digest)
+
+
 class ScreenCapture:
     """
     Screen capture using mss library
@@ -42,6 +69,41 @@ class ScreenCapture:
         
         self.sct = mss.mss()
         self.last_screenshot: Optional[np.ndarray] = None
+        
+        # Last screenshot_to_base64 result, keyed by (frame digest, format, quality)
+        self._last_b64_key: Optional[Tuple] = None
+        self._last_b64: Optional[str] = None
+        
+        # Background double-buffered capture (see start_background)
+        self._bg_thread: Optional[threading.Thread] = None
+        self._bg_stop = threading.Event()
+        self._bg_ready = threading.Event()
+        self._bg_lock = threading.Lock()
+        self._bg_buffers: List[np.ndarray] = []
+        self._bg_write_index = 0
+        self._bg_latest: Optional[int] = None
+    
+    @staticmethod
+    def _bgra_view(screenshot) -> np.ndarray:
+        """
+        View an mss screenshot as a (height, width, 4) BGRA array
+        
+        ADR Note: np.array(screenshot) copied the raw buffer and a
+        BGRA->BGR cvtColor copied it again. Wrapping screenshot.raw with
+        np.frombuffer costs nothing; change detection and selectROI accept
+        BGRA directly. Encoders drop the pad byte via _bgr_view, since mss
+        does not fill it with a real alpha value.
+        """
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+    
+    @staticmethod
+    def _bgr_view(image: np.ndarray) -> np.ndarray:
+        """View a BGRA frame as BGR (no copy); other images pass through"""
+        if image.ndim == 3 and image.shape[2] == 4:
+            return image[..., :3]
+        return image
     
     def capture_region(
         self,
@@ -62,7 +124,7 @@ class ScreenCapture:
             monitor: Monitor number (None for primary)
         
         Returns:
-            NumPy array (BGR format for OpenCV) or None on error
+            NumPy array (BGRA format, as delivered by mss) or None on error
         """
         try:
             if monitor is None:
@@ -78,12 +140,7 @@ class ScreenCapture:
             
             # Capture screenshot
             screenshot = self.sct.grab(monitor_dict)
-            
-            # Convert to numpy array (BGR for OpenCV)
-            img = np.array(screenshot)
-            # mss returns BGRA, convert to BGR
-            if img.shape[2] == 4:
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR) if CV2_AVAILABLE else img[:, :, :3]
+            img = self._bgra_view(screenshot)
             
             self.last_screenshot = img
             return img
@@ -92,6 +149,176 @@ class ScreenCapture:
             logger.error(f"Failed to capture region: {e}")
             return None
     
+    def capture_region_into(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        out: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """
+        Capture a screen region into a preallocated BGR buffer
+        
+        ADR Note: Continuous monitoring captures the same regions every
+        tick; writing into a reused (height, width, 3) uint8 buffer avoids
+        allocating a fresh frame per region per tick.
+        
+        Args:
+            x, y, width, height: Region coordinates
+            out: Destination buffer of shape (height, width, 3), dtype uint8
+        
+        Returns:
+            out on success, None on error
+        """
+        try:
+            screenshot = self.sct.grab({
+                "top": y,
+                "left": x,
+                "width": width,
+                "height": height
+            })
+            
+            # mss returns BGRA; view it without copying, then convert into out
+            bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(height, width, 4)
+            if CV2_AVAILABLE:
+                cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+            else:
+                np.copyto(out, bgra[:, :, :3])
+            
+            self.last_screenshot = out
+            return out
+        
+        except Exception as e:
+            logger.error(f"Failed to capture region: {e}")
+            return None
+    
+    def start_background(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        fps: float = 30.0
+    ) -> bool:
+        """
+        Continuously capture a region on a background thread
+        
+        ADR Note: sct.grab() blocks while the compositor copies pixels out.
+        Capturing on a dedicated thread into one of two preallocated BGRA
+        buffers, while the consumer reads the other via get_latest(),
+        overlaps capture with analysis. mss instances are not thread-safe,
+        so the thread opens its own.
+        
+        Args:
+            x, y, width, height: Region coordinates
+            fps: Target capture rate
+        
+        Returns:
+            True if the capture thread was started
+        """
+        if self._bg_thread and self._bg_thread.is_alive():
+            logger.warning("Background capture already running")
+            return False
+        
+        self._bg_buffers = [np.empty((height, width, 4), dtype=np.uint8) for _ in range(2)]
+        self._bg_write_index = 0
+        self._bg_latest = None
+        self._bg_stop.clear()
+        self._bg_ready.clear()
+        
+        monitor_dict = {"top": y, "left": x, "width": width, "height": height}
+        interval = 1.0 / fps if fps > 0 else 0.0
+        self._bg_thread = threading.Thread(
+            target=self._background_loop,
+            args=(monitor_dict, interval),
+            daemon=True
+        )
+        self._bg_thread.start()
+        logger.info(f"Started background capture of {width}x{height} at ({x}, {y}), {fps} fps")
+        return True
+    
+    def _background_loop(self, monitor_dict: Dict[str, int], interval: float):
+        """Capture thread: grab into the back buffer, then publish it"""
+        try:
+            sct = mss.mss()
+        except Exception as e:
+            logger.error(f"Failed to open background capture: {e}")
+            return
+        
+        try:
+            while not self._bg_stop.is_set():
+                started = time.perf_counter()
+                try:
+                    screenshot = sct.grab(monitor_dict)
+                    np.copyto(self._bg_buffers[self._bg_write_index], self._bgra_view(screenshot))
+                except Exception as e:
+                    logger.error(f"Background capture failed: {e}")
+                else:
+                    with self._bg_lock:
+                        self._bg_latest = self._bg_write_index
+                        self._bg_write_index ^= 1
+                    self._bg_ready.set()
+                
+                self._bg_stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+        finally:
+            sct.close()
+    
+    def get_latest(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Most recent background frame (BGRA), without copying
+        
+        The returned buffer is overwritten two captures later; copy it if it
+        must outlive the next analysis step.
+        
+        Args:
+            timeout: Seconds to wait for the first frame (None waits forever)
+        
+        Returns:
+            NumPy array, or None if no frame is available
+        """
+        if self._bg_latest is None and not self._bg_ready.wait(timeout):
+            return None
+        with self._bg_lock:
+            if self._bg_latest is None:
+                return None
+            return self._bg_buffers[self._bg_latest]
+    
+    def stop_background(self):
+        """Stop background capture"""
+        self._bg_stop.set()
+        if self._bg_thread:
+            self._bg_thread.join(timeout=2.0)
+            self._bg_thread = None
+        logger.info("Stopped background capture")
+    
+    def close(self):
+        """
+        Release the mss handle (display connection / device contexts)
+        
+        ADR Note: One mss instance is opened in __init__ and reused by every
+        capture, so the X11/Win32 connection is set up once per ScreenCapture
+        rather than per grab. Use the instance as a context manager, or call
+        close(), to release it deterministically.
+        """
+        if self._bg_thread:
+            self.stop_background()
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
     def capture_window(
         self,
         window_title: Optional[str] = None,
@@ -207,43 +434,77 @@ class ScreenCapture:
             monitor: Monitor number (None for primary)
         
         Returns:
-            NumPy array or None on error
+            NumPy array (BGRA) or None on error
         """
         try:
             if monitor is None:
                 monitor = self.sct.monitors[0]
             
             screenshot = self.sct.grab(monitor)
-            img = np.array(screenshot)
-            
-            if img.shape[2] == 4:
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR) if CV2_AVAILABLE else img[:, :, :3]
-            
-            return img
+            return self._bgra_view(screenshot)
         
         except Exception as e:
             logger.error(f"Failed to capture full screen: {e}")
             return None
     
     def save_screenshot(self, image: np.ndarray, path: Path) -> bool:
-        """Save screenshot to file"""
+        """Save screenshot to file (ndarray, or an mss ScreenShot as grabbed)"""
+        if not isinstance(image, np.ndarray) and hasattr(image, "rgb"):
+            return self.save_raw_screenshot(image, path)
+        
         if not CV2_AVAILABLE:
             logger.error("OpenCV not available, cannot save screenshot")
             return False
         
         try:
-            cv2.imwrite(str(path), image)
+            cv2.imwrite(str(path), self._bgr_view(image))
             return True
         except Exception as e:
             logger.error(f"Failed to save screenshot: {e}")
             return False
     
-    def screenshot_to_base64(self, image: np.ndarray) -> Optional[str]:
+    def save_raw_screenshot(self, screenshot, path: Path, level: int = 6) -> bool:
+        """
+        Save an mss ScreenShot straight to PNG
+        
+        ADR Note: For grab-and-store debugging dumps, mss.tools.to_png writes
+        the grabbed pixels directly, skipping the ndarray view, any BGRA
+        conversion and OpenCV's encoder.
+        
+        Args:
+            screenshot: mss ScreenShot returned by sct.grab()
+            path: Output PNG path
+            level: zlib compression level (0-9)
+        """
+        try:
+            mss.tools.to_png(screenshot.rgb, screenshot.size, level=level, output=str(path))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save raw screenshot: {e}")
+            return False
+    
+    def screenshot_to_base64(
+        self,
+        image: np.ndarray,
+        image_format: str = "png",
+        jpeg_quality: int = 85
+    ) -> Optional[str]:
         """
         Convert screenshot to base64 string for transmission
         
         ADR Note: Useful for sending screenshots via MCP or other protocols.
-        Returns base64-encoded PNG image.
+        PNG (lossless, deflate-bound) is the default and is written at zlib
+        level 1 - screenshots compress nearly as well as at the default
+        level 3 for a fraction of the CPU. JPEG goes through OpenCV's
+        libjpeg-turbo encoder and is much cheaper for large windows.
+        Re-sending an unchanged frame returns the previous encoding. BGRA
+        frames are encoded as BGR: mss's fourth byte is padding, not alpha
+        (GDI leaves it 0, which would make the PNG fully transparent).
+        
+        Args:
+            image: BGR or BGRA image
+            image_format: "png" or "jpeg"
+            jpeg_quality: JPEG quality (0-100), ignored for PNG
         """
         if not CV2_AVAILABLE:
             logger.error("OpenCV not available, cannot encode screenshot")
@@ -251,16 +512,24 @@ class ScreenCapture:
         
         try:
             import base64
-            import io
             
-            # Encode image as PNG
-            success, buffer = cv2.imencode('.png', image)
+            key = (frame_digest(image), image_format, jpeg_quality if image_format == "jpeg" else None)
+            if key == self._last_b64_key:
+                return self._last_b64
+            
+            image = self._bgr_view(image)
+            if image_format == "jpeg":
+                success, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+            else:
+                success, buffer = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
             if not success:
                 logger.error("Failed to encode image")
                 return None
             
             # Convert to base64
             img_base64 = base64.b64encode(buffer).decode('utf-8')
+            self._last_b64_key = key
+            self._last_b64 = img_base64
             return img_base64
         
         except Exception as e:
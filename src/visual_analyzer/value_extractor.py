@@ -6,7 +6,8 @@ Uses pixel analysis and optional OCR for text extraction.
 """
 
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List, Tuple
 import numpy as np
 
 try:
@@ -22,6 +23,14 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     logging.debug("pytesseract not available. OCR features disabled.")
 
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+from .change_detector import color_bounds
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,30 +42,128 @@ class ValueExtractor:
     Pixel analysis is preferred for numeric displays, OCR for text.
     """
     
+    # Batched OCR tiling: every region is scaled to this height and the
+    # tiles are stacked with black strips of OCR_TILE_GAP rows in between
+    OCR_TILE_HEIGHT = 32
+    OCR_TILE_GAP = 16
+    
     def __init__(self, use_ocr: bool = False):
         """
         Initialize value extractor
         
+        ADR Note: With tesserocr installed, one libtesseract handle is
+        created here and reused for every call; pytesseract fork-execs the
+        tesseract binary (and reloads its model) per image, which costs
+        50-200ms a frame. pytesseract remains the fallback.
+        
+        Args:
+            use_ocr: Enable OCR for text extraction (requires tesserocr or pytesseract)
+        """
+        self.use_ocr = use_ocr and (TESSEROCR_AVAILABLE or TESSERACT_AVAILABLE)
+        if use_ocr and not self.use_ocr:
+            logger.warning("OCR requested but neither tesserocr nor pytesseract is available")
+        
+        # OCR contrast boost (x1.5 + 30, saturated) as a 256-entry table
+        self._contrast_lut = np.clip(np.round(np.arange(256) * 1.5 + 30), 0, 255).astype(np.uint8)
+        
+        self._api = None
+        # Region analysis runs on a thread pool; the handle is not thread-safe
+        self._api_lock = threading.Lock()
+        if self.use_ocr and TESSEROCR_AVAILABLE:
+            try:
+                self._api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE)
+            except Exception as e:
+                logger.warning(f"Failed to initialize tesserocr, falling back to pytesseract: {e}")
+                self.use_ocr = TESSERACT_AVAILABLE
+    
+    def close(self):
+        """Release the tesseract handle"""
+        if self._api is not None:
+            with self._api_lock:
+                self._api.End()
+                self._api = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _ocr(self, gray: np.ndarray, digits_only: bool = False) -> str:
+        """
+        Run OCR on a grayscale uint8 image
+        
         Args:
-            use_ocr: Enable OCR for text extraction (requires pytesseract)
+            gray: Grayscale image
+            digits_only: Single text line restricted to 0-9
+        """
+        if self._api is not None:
+            gray = np.ascontiguousarray(gray)
+            height, width = gray.shape[:2]
+            with self._api_lock:
+                if digits_only:
+                    self._api.SetPageSegMode(tesserocr.PSM.SINGLE_LINE)
+                    self._api.SetVariable("tessedit_char_whitelist", "0123456789")
+                else:
+                    self._api.SetPageSegMode(tesserocr.PSM.AUTO)
+                    self._api.SetVariable("tessedit_char_whitelist", "")
+                self._api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+                return self._api.GetUTF8Text()
+        
+        if digits_only:
+            return pytesseract.image_to_string(gray, config='--psm 7 -c tessedit_char_whitelist=0123456789')
+        return pytesseract.image_to_string(gray)
+    
+    def _ocr_words(self, gray: np.ndarray, digits_only: bool = False) -> List[Tuple[str, int, int, int, float]]:
+        """
+        Run OCR on a grayscale block of text lines
+        
+        Returns:
+            List of (text, left, top, height, confidence 0-100) per word
         """
-        self.use_ocr = use_ocr and TESSERACT_AVAILABLE
-        if use_ocr and not TESSERACT_AVAILABLE:
-            logger.warning("OCR requested but pytesseract not available")
+        words = []
+        if self._api is not None:
+            gray = np.ascontiguousarray(gray)
+            height, width = gray.shape[:2]
+            level = tesserocr.RIL.WORD
+            with self._api_lock:
+                self._api.SetPageSegMode(tesserocr.PSM.SINGLE_BLOCK)
+                self._api.SetVariable("tessedit_char_whitelist", "0123456789" if digits_only else "")
+                self._api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+                self._api.Recognize()
+                for word in tesserocr.iterate_level(self._api.GetIterator(), level):
+                    text = word.GetUTF8Text(level)
+                    box = word.BoundingBox(level)
+                    if text and box:
+                        words.append((text, box[0], box[1], box[3] - box[1], word.Confidence(level)))
+            return words
+        
+        config = '--psm 6'
+        if digits_only:
+            config += ' -c tessedit_char_whitelist=0123456789'
+        data = pytesseract.image_to_data(gray, config=config, output_type=pytesseract.Output.DICT)
+        for text, left, top, height, conf in zip(
+            data["text"], data["left"], data["top"], data["height"], data["conf"]
+        ):
+            if text and text.strip():
+                words.append((text, int(left), int(top), int(height), float(conf)))
+        return words
     
     def extract_value(
         self,
         image: np.ndarray,
         region: Optional[tuple] = None,
-        value_type: str = "auto"
+        value_type: str = "auto",
+        pixel_threshold: int = 0
     ) -> Dict[str, Any]:
         """
         Extract value from image region
         
         Args:
-            image: Image (BGR numpy array)
+            image: Image (BGR or BGRA numpy array)
             region: (x, y, w, h) region to extract from (None for full image)
             value_type: "auto", "number", "text", "pixel_count"
+            pixel_threshold: For "pixel_count", gray level a pixel must exceed to count
         
         Returns:
             Dictionary with extracted value:
@@ -82,12 +189,109 @@ class ValueExtractor:
         elif value_type == "text":
             result = self._extract_text(image)
         elif value_type == "pixel_count":
-            result = self._extract_pixel_count(image)
+            result = self._extract_pixel_count(image, pixel_threshold)
         else:
             result = {"value": None, "confidence": 0.0, "method": "unknown", "raw": ""}
         
         return result
     
+    def extract_values(
+        self,
+        image: np.ndarray,
+        regions: List[tuple],
+        value_type: str = "auto"
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract values from several regions of one image with a single OCR pass
+        
+        ADR Note: Each OCR call pays fixed setup and layout-analysis costs, so
+        monitoring N value regions per frame multiplied them by N. The regions
+        are instead scaled to a common height, stacked vertically with black
+        separator strips, recognized once, and the words are assigned back
+        to their region by vertical position. Without OCR (or for
+        "pixel_count") this is a loop over extract_value.
+        
+        Args:
+            image: Image (BGR or BGRA numpy array)
+            regions: List of (x, y, w, h) regions
+            value_type: "auto", "number", "text", "pixel_count"
+        
+        Returns:
+            One result dictionary per region, in order (see extract_value)
+        """
+        if not regions:
+            return []
+        if not self.use_ocr or not CV2_AVAILABLE or value_type not in ("auto", "number", "text"):
+            return [self.extract_value(image, region, value_type) for region in regions]
+        
+        tile_height = self.OCR_TILE_HEIGHT
+        stride = tile_height + self.OCR_TILE_GAP
+        
+        tiles = []
+        for x, y, w, h in regions:
+            gray = self._ocr_preprocess(image[y:y+h, x:x+w])
+            if gray.size == 0:
+                tiles.append(np.zeros((tile_height, 1), dtype=np.uint8))
+                continue
+            width = max(1, round(gray.shape[1] * tile_height / gray.shape[0]))
+            tiles.append(cv2.resize(gray, (width, tile_height), interpolation=cv2.INTER_LINEAR))
+        
+        sheet = np.zeros(
+            (stride * len(tiles) - self.OCR_TILE_GAP, max(t.shape[1] for t in tiles)),
+            dtype=np.uint8
+        )
+        for index, tile in enumerate(tiles):
+            sheet[index * stride:index * stride + tile_height, :tile.shape[1]] = tile
+        
+        buckets: List[List[Tuple[int, str, float]]] = [[] for _ in regions]
+        try:
+            for text, left, top, height, conf in self._ocr_words(sheet, digits_only=value_type == "number"):
+                index = (top + height // 2) // stride
+                if 0 <= index < len(buckets):
+                    buckets[index].append((left, text.strip(), conf))
+        except Exception as e:
+            logger.debug(f"Batched OCR failed: {e}")
+        
+        results = []
+        for words in buckets:
+            words.sort()
+            raw = " ".join(text for _, text, _ in words if text)
+            if not raw:
+                results.append({"value": None, "confidence": 0.0, "method": "ocr", "raw": ""})
+                continue
+            
+            confidence = min(max(sum(conf for _, _, conf in words) / len(words) / 100.0, 0.0), 1.0)
+            value = raw
+            if value_type in ("auto", "number"):
+                try:
+                    value = int(raw.replace(" ", ""))
+                except ValueError:
+                    value = None if value_type == "number" else raw
+            results.append({"value": value, "confidence": confidence, "method": "ocr", "raw": raw})
+        
+        return results
+    
+    @staticmethod
+    def _to_gray(image: np.ndarray) -> np.ndarray:
+        """Grayscale view of a BGR or BGRA (raw mss) image"""
+        if image.ndim != 3:
+            return image
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(image, code)
+    
+    def _ocr_preprocess(self, image: np.ndarray) -> np.ndarray:
+        """
+        Grayscale + contrast enhancement for OCR
+        
+        ADR Note: The contrast step is a cv2.LUT lookup (one byte read and
+        written per pixel, no multiplies) instead of convertScaleAbs, and
+        for color input it runs in place on the freshly converted gray image.
+        """
+        gray = self._to_gray(image)
+        if gray is image:
+            return cv2.LUT(gray, self._contrast_lut)
+        return cv2.LUT(gray, self._contrast_lut, dst=gray)
+    
     def _extract_number(self, image: np.ndarray) -> Dict[str, Any]:
         """
         Extract numeric value using OCR
@@ -99,16 +303,14 @@ class ValueExtractor:
             return {"value": None, "confidence": 0.0, "method": "pixel", "raw": ""}
         
         # Preprocess image for better OCR
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-        
-        # Enhance contrast
-        gray = cv2.convertScaleAbs(gray, alpha=1.5, beta=30)
+        # Grayscale and enhance contrast
+        gray = self._ocr_preprocess(image)
         
         # Try OCR if available
         if self.use_ocr:
             try:
                 # OCR with digits-only config
-                text = pytesseract.image_to_string(gray, config='--psm 7 -c tessedit_char_whitelist=0123456789')
+                text = self._ocr(gray, digits_only=True)
                 text = text.strip()
                 
                 if text:
@@ -135,10 +337,9 @@ class ValueExtractor:
             return {"value": None, "confidence": 0.0, "method": "ocr", "raw": ""}
         
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-            gray = cv2.convertScaleAbs(gray, alpha=1.5, beta=30)
+            gray = self._ocr_preprocess(image)
             
-            text = pytesseract.image_to_string(gray)
+            text = self._ocr(gray)
             text = text.strip()
             
             if text:
@@ -153,22 +354,31 @@ class ValueExtractor:
         
         return {"value": None, "confidence": 0.0, "method": "ocr", "raw": ""}
     
-    def _extract_pixel_count(self, image: np.ndarray) -> Dict[str, Any]:
+    def _extract_pixel_count(self, image: np.ndarray, threshold: int = 0) -> Dict[str, Any]:
         """
         Count pixels (useful for progress bars, health bars, etc.)
         
         ADR Note: Counts non-black pixels. Useful for estimating
-        progress/health percentages.
+        progress/health percentages. A threshold (e.g. 32) ignores
+        near-black UI chrome via cv2.threshold + countNonZero.
+        
+        Args:
+            image: Image
+            threshold: Gray level a pixel must exceed to be counted
         """
         if not CV2_AVAILABLE:
             return {"value": None, "confidence": 0.0, "method": "pixel", "raw": ""}
         
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        gray = self._to_gray(image)
         
-        # Count non-zero pixels
+        # Count pixels brighter than threshold
         total_pixels = gray.size
-        non_zero = np.count_nonzero(gray)
-        percentage = (non_zero / total_pixels) * 100
+        if threshold > 0:
+            _, mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
+            non_zero = cv2.countNonZero(mask)
+        else:
+            non_zero = np.count_nonzero(gray)
+        percentage = (non_zero / total_pixels) * 100 if total_pixels else 0.0
         
         return {
             "value": int(percentage),
@@ -197,8 +407,7 @@ class ValueExtractor:
         
         if color:
             # Count pixels matching color
-            lower = np.array([max(0, c - 10) for c in color])
-            upper = np.array([min(255, c + 10) for c in color])
+            lower, upper = color_bounds(color, 10, image.shape[2])
             mask = cv2.inRange(image, lower, upper)
             count = np.sum(mask > 0)
             total = mask.size
@@ -211,12 +420,7 @@ class ValueExtractor:
                 "raw": f"{count}/{total} matching pixels"
             }
         
-        # Extract dominant color
-        # Reshape image to list of pixels
-        pixels = image.reshape(-1, 3)
-        # Get most common color
-        unique, counts = np.unique(pixels, axis=0, return_counts=True)
-        dominant_color = unique[np.argmax(counts)]
+        dominant_color = self._dominant_color(image)
         
         return {
             "value": tuple(dominant_color),
@@ -224,4 +428,31 @@ class ValueExtractor:
             "method": "color",
             "raw": f"RGB{dominant_color}"
         }
+    
+    @staticmethod
+    def _dominant_color(image: np.ndarray) -> tuple:
+        """
+        Most common color of a 3-channel image
+        
+        ADR Note: Packs each pixel into a uint32 key and picks the busiest
+        bin of a 5-bit/channel (32K entry) histogram with np.bincount - one
+        O(N) pass instead of np.unique(axis=0), which sorted every pixel
+        tuple. The most common exact color among the pixels of that bin is
+        returned. This is still an approximation: an exact color that is
+        most common overall but sits alone in its bin can lose to a bin
+        holding several near-shades that are each less common.
+        """
+        pixels = image.reshape(-1, image.shape[-1])[:, :3].astype(np.uint32)
+        keys = pixels[:, 0] | (pixels[:, 1] << 8) | (pixels[:, 2] << 16)
+        
+        quantized = ((pixels[:, 0] >> 3)
+                     | ((pixels[:, 1] >> 3) << 5)
+                     | ((pixels[:, 2] >> 3) << 10))
+        dominant_bin = np.bincount(quantized, minlength=1 << 15).argmax()
+        
+        bin_keys = keys[quantized == dominant_bin]
+        unique, counts = np.unique(bin_keys, return_counts=True)
+        key = int(unique[np.argmax(counts)])
+        
+        return (key & 0xFF, (key >> 8) & 0xFF, (key >> 16) & 0xFF)
 
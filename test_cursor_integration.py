@@ -3,122 +3,140 @@
 Test Cursor Integration
 
 Verifies that the MCP server configuration is correct and can be used in Cursor.
+
+ADR Note: The checks are independent once the config is loaded, so they run
+on a small thread pool (filesystem probes can be slow on Windows/network
+drives). Each check returns (passed, output lines) instead of printing, and
+main() prints the results in order.
 """
 
+import os
 import sys
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_cursor_config():
-    """Check if Cursor MCP config includes our server"""
-    config_path = Path.home() / ".cursor" / "mcp.json"
+@functools.cache
+def _config_path() -> Path:
+    """Location of Cursor's MCP config (home directory resolved once)"""
+    return Path.home() / ".cursor" / "mcp.json"
+
+@functools.lru_cache(maxsize=4)
+def _parse_cursor_config(path: str, mtime_ns: int):
+    """Parse mcp.json; cached per (path, mtime) so unchanged files are read once"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return json.load(f)
+
+def load_cursor_config():
+    """
+    Load Cursor's MCP config once for all checks
     
-    if not config_path.exists():
-        print("❌ Cursor MCP config not found")
-        print(f"   Expected: {config_path}")
-        print("\n   Run: .\\setup_cursor_mcp.ps1")
-        return False
+    Returns:
+        (config_path, config or None, error message or None).
+        A missing file gives (config_path, None, None).
+    """
+    config_path = _config_path()
     
     try:
-        # Handle UTF-8 BOM if present
-        with open(config_path, 'rb') as f:
-            content = f.read()
-            # Remove BOM if present
-            if content.startswith(b'\xef\xbb\xbf'):
-                content = content[3:]
-            config = json.loads(content.decode('utf-8'))
-        
-        servers = config.get("mcpServers", {})
-        
-        if "reverse-engineering-orchestrator" in servers:
-            server_config = servers["reverse-engineering-orchestrator"]
-            print("✅ Reverse Engineering Orchestrator found in Cursor config")
-            print(f"   Command: {server_config.get('command', 'N/A')}")
-            print(f"   Args: {server_config.get('args', [])}")
-            print(f"   CWD: {server_config.get('cwd', 'N/A')}")
-            return True
-        else:
-            print("❌ Reverse Engineering Orchestrator not found in Cursor config")
-            print(f"   Available servers: {list(servers.keys())}")
-            print("\n   Run: .\\setup_cursor_mcp.ps1")
-            return False
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return config_path, None, None
     
+    try:
+        return config_path, _parse_cursor_config(str(config_path), mtime_ns), None
     except json.JSONDecodeError as e:
-        print(f"❌ Error parsing mcp.json: {e}")
-        return False
+        return config_path, None, f"Error parsing mcp.json: {e}"
     except Exception as e:
-        print(f"❌ Error reading config: {e}")
-        return False
+        return config_path, None, f"Error reading config: {e}"
 
-def check_python_path():
-    """Check if Python path in config is valid"""
-    config_path = Path.home() / ".cursor" / "mcp.json"
-    
-    if not config_path.exists():
-        return False
-    
-    try:
-        with open(config_path, 'r', encoding='utf-8-sig') as f:
-            config = json.load(f)
-        
-        server_config = config.get("mcpServers", {}).get("reverse-engineering-orchestrator")
-        if not server_config:
-            return False
-        
-        python_path = Path(server_config.get("command", ""))
-        if python_path.exists():
-            print(f"✅ Python executable found: {python_path}")
-            return True
-        else:
-            print(f"❌ Python executable not found: {python_path}")
-            return False
-    
-    except Exception:
-        return False
+def check_cursor_config(config_path, config, error=None):
+    """Check if Cursor MCP config includes our server; returns (passed, lines)"""
+    if error:
+        return False, [f"❌ {error}"]
+    
+    if config is None:
+        return False, [
+            "❌ Cursor MCP config not found",
+            f"   Expected: {config_path}",
+            "\n   Run: .\\setup_cursor_mcp.ps1",
+        ]
+    
+    servers = config.get("mcpServers", {})
+    
+    if "reverse-engineering-orchestrator" in servers:
+        server_config = servers["reverse-engineering-orchestrator"]
+        return True, [
+            "✅ Reverse Engineering Orchestrator found in Cursor config",
+            f"   Command: {server_config.get('command', 'N/A')}",
+            f"   Args: {server_config.get('args', [])}",
+            f"   CWD: {server_config.get('cwd', 'N/A')}",
+        ]
+    else:
+        return False, [
+            "❌ Reverse Engineering Orchestrator not found in Cursor config",
+            f"   Available servers: {list(servers.keys())}",
+            "\n   Run: .\\setup_cursor_mcp.ps1",
+        ]
 
-def check_project_path():
-    """Check if project path in config is valid"""
-    config_path = Path.home() / ".cursor" / "mcp.json"
-    
-    if not config_path.exists():
-        return False
-    
-    try:
-        with open(config_path, 'r', encoding='utf-8-sig') as f:
-            config = json.load(f)
-        
-        server_config = config.get("mcpServers", {}).get("reverse-engineering-orchestrator")
-        if not server_config:
-            return False
-        
-        project_path = Path(server_config.get("cwd", ""))
-        if project_path.exists() and (project_path / "src" / "mcp_server").exists():
-            print(f"✅ Project path valid: {project_path}")
-            return True
-        else:
-            print(f"❌ Project path invalid: {project_path}")
-            return False
-    
-    except Exception:
-        return False
+def check_python_path(config):
+    """Check if Python path in config is valid; returns (passed, lines)"""
+    if config is None:
+        return False, []
+    
+    server_config = config.get("mcpServers", {}).get("reverse-engineering-orchestrator")
+    if not server_config:
+        return False, []
+    
+    python_path = Path(server_config.get("command", ""))
+    # Existence only: access(F_OK) skips stat()'s struct marshaling
+    if os.access(python_path, os.F_OK):
+        return True, [f"✅ Python executable found: {python_path}"]
+    else:
+        return False, [f"❌ Python executable not found: {python_path}"]
+
+def check_project_path(config):
+    """Check if project path in config is valid; returns (passed, lines)"""
+    if config is None:
+        return False, []
+    
+    server_config = config.get("mcpServers", {}).get("reverse-engineering-orchestrator")
+    if not server_config:
+        return False, []
+    
+    project_path = Path(server_config.get("cwd", ""))
+    server_dir = str(project_path / "src" / "mcp_server")
+    if os.access(project_path, os.F_OK) and os.access(server_dir, os.F_OK):
+        return True, [f"✅ Project path valid: {project_path}"]
+    else:
+        return False, [f"❌ Project path invalid: {project_path}"]
 
 def main():
     print("Testing Cursor Integration\n")
     print("=" * 50)
     
     results = []
-    
-    # Check 1: Config file exists and contains our server
-    print("\n1. Checking Cursor MCP configuration...")
-    results.append(("Config", check_cursor_config()))
-    
-    # Check 2: Python path is valid
-    print("\n2. Checking Python executable...")
-    results.append(("Python", check_python_path()))
-    
-    # Check 3: Project path is valid
-    print("\n3. Checking project path...")
-    results.append(("Project", check_project_path()))
+    config_path, config, error = load_cursor_config()
+    
+    checks = [
+        # Config file exists and contains our server
+        ("Config", "1. Checking Cursor MCP configuration...",
+         lambda: check_cursor_config(config_path, config, error)),
+        # Python path is valid
+        ("Python", "2. Checking Python executable...",
+         lambda: check_python_path(config)),
+        # Project path is valid
+        ("Project", "3. Checking project path...",
+         lambda: check_project_path(config)),
+    ]
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        outcomes = list(pool.map(lambda check: check[2](), checks))
+    
+    for (name, title, _), (passed, lines) in zip(checks, outcomes):
+        print(f"\n{title}")
+        for line in lines:
+            print(line)
+        results.append((name, passed))
     
     # Summary
     print("\n" + "=" * 50)
@@ -4,6 +4,9 @@ Quick test script for tool detection
 
 ADR Note: This script allows testing the detection system without running
 the full MCP server. Useful for development and debugging.
+
+Usage: python test_detection.py [--fast]
+  --fast  Stop at the first available tool instead of probing every tool
 """
 
 import sys
@@ -18,11 +21,12 @@ def main():
     print("Reverse Engineering Orchestrator - Tool Detection Test")
     print("=" * 60)
     
+    fast = "--fast" in sys.argv[1:]
     detector = ToolDetector()
     
     # Detect all tools
-    print("\nDetecting all tools...")
-    all_results = detector.detect_all()
+    print("\nDetecting all tools..." if not fast else "\nDetecting first available tool...")
+    all_results = detector.detect_all(stop_on_first=fast)
     
     for tool_type, result in all_results.items():
         print(f"\n{tool_type.value.upper()}:")
@@ -43,7 +47,11 @@ def main():
     # Get available tool
     print("\n" + "=" * 60)
     print("Selecting available tool...")
-    available = detector.detect_available()
+    if fast:
+        # Partial results already end at the first available tool
+        available = next((r for r in all_results.values() if r.is_available), None)
+    else:
+        available = detector.detect_available()
     
     if available:
         print(f"\n✓ Selected: {available.tool_type.value}")
@@ -3,6 +3,10 @@
 Test MCP Server
 
 Basic test to verify MCP server can start and initialize adapters.
+
+ADR Note: The MCP server modules (and the MCP SDK behind them) are imported
+inside test_server() so the import cost is only paid when the test runs.
+The single coroutine runs on a plain event loop rather than asyncio.run().
 """
 
 import sys
@@ -12,11 +16,14 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.mcp_server.config import ServerConfig
-from src.mcp_server.protocol import MCPProtocolHandler
 from src.tool_detection import ToolDetector
 
 async def test_server():
+    # Importing anything under src.mcp_server loads the MCP SDK via the
+    # package __init__, so both imports are deferred to here
+    from src.mcp_server.config import ServerConfig
+    from src.mcp_server.protocol import MCPProtocolHandler
+    
     print("Testing MCP Server Initialization\n")
     
     # Create config
@@ -40,7 +47,7 @@ async def test_server():
     
     # Initialize adapter
     print("Initializing adapter...")
-    init_result = await handler._initialize_adapter()
+    init_result = await handler._initialize_adapter(detected)
     
     if init_result.get("success"):
         print("✅ Adapter initialized successfully")
@@ -58,8 +65,9 @@ async def test_server():
     return 0
 
 if __name__ == "__main__":
+    loop = asyncio.new_event_loop()
     try:
-        result = asyncio.run(test_server())
+        result = loop.run_until_complete(test_server())
         sys.exit(result)
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
@@ -69,4 +77,6 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        loop.close()
 
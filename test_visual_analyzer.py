@@ -2,10 +2,14 @@
 """
 Test Visual Analyzer
 
-Tests the OpenCV visual analyzer components.
+Tests the OpenCV visual analyzer components. The tests run concurrently
+(each in its own thread) and their output is printed per test afterwards.
 """
 
+import asyncio
+import io
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -49,6 +53,26 @@ def test_screen_capture():
         print(f"  ❌ Error: {e}")
         return False
 
+def _wait_for_change(capture, bbox, reference, timeout=1.0, poll=0.05):
+    """
+    Capture bbox until it differs from reference, or until timeout
+    
+    Returns the last captured frame (None if a capture failed), so a static
+    screen still yields a second frame after at most timeout seconds.
+    """
+    import cv2
+    
+    x, y, width, height = bbox
+    deadline = time.monotonic() + timeout
+    while True:
+        frame = capture.capture_region(x, y, width, height)
+        if frame is None or time.monotonic() >= deadline:
+            return frame
+        diff = cv2.absdiff(frame, reference)
+        if cv2.countNonZero(diff.reshape(diff.shape[0], -1)) > 0:
+            return frame
+        time.sleep(poll)
+
 def test_change_detector():
     """Test change detection"""
     print("\nTesting Change Detector...")
@@ -57,6 +81,19 @@ def test_change_detector():
         from src.visual_analyzer import ScreenCapture, ChangeDetector
         import numpy as np
         
+        # Synthetic frames: one 40x40 block changes, so exactly one region
+        # (full-resolution x, y, w, h) must come back
+        print("  Checking synthetic frames...")
+        base = np.zeros((200, 200, 3), dtype=np.uint8)
+        moved = base.copy()
+        moved[80:120, 80:120] = 255
+        synthetic = ChangeDetector(threshold=0.01).detect_changes(moved, base)
+        if not synthetic["changed"] or synthetic["changed_regions"] != [(80, 80, 40, 40)]:
+            print(f"  ❌ Unexpected synthetic result: {synthetic['changed_regions']}")
+            return False
+        print(f"  ✅ Synthetic change: {synthetic['change_percentage']:.2%}, "
+              f"regions {synthetic['changed_regions']}")
+        
         capture = ScreenCapture()
         detector = ChangeDetector(threshold=0.01)
         
@@ -68,11 +105,8 @@ def test_change_detector():
             print("  ❌ Failed to capture frame 1")
             return False
         
-        print("  Waiting 1 second...")
-        time.sleep(1)
-        
-        print("  Capturing frame 2...")
-        frame2 = capture.capture_region(0, 0, 200, 200)
+        print("  Capturing frame 2 (on first change, at most 1 second)...")
+        frame2 = _wait_for_change(capture, (0, 0, 200, 200), frame1)
         
         if frame2 is None:
             print("  ❌ Failed to capture frame 2")
@@ -102,12 +136,19 @@ def test_visual_analyzer():
     try:
         from src.visual_analyzer import VisualAnalyzer
         
-        analyzer = VisualAnalyzer(change_threshold=0.05, capture_interval=0.5)
+        analyzer = VisualAnalyzer(change_threshold=0.05, capture_interval=0.5, downsample=2)
         
         # Test single region analysis
         print("  Analyzing region (100x100 at 0,0)...")
         result = analyzer.analyze_region(0, 0, 100, 100, "test_region")
         
+        # Change detection keeps only the 2x-downsampled grayscale frame
+        reduced = analyzer.change_detector.previous_frame
+        if reduced is None or reduced.shape != (50, 50):
+            print(f"  ❌ Unexpected reduced frame: {None if reduced is None else reduced.shape}")
+            return False
+        print(f"  ✅ Reduced frame: {reduced.shape}")
+        
         print(f"  ✅ Analysis result:")
         print(f"     Region: {result.get('region_name')}")
         print(f"     Changed: {result.get('changed')}")
@@ -125,15 +166,67 @@ def test_visual_analyzer():
         traceback.print_exc()
         return False
 
+class _PerThreadStdout(io.TextIOBase):
+    """
+    sys.stdout stand-in used while tests run concurrently
+    
+    Writes from a thread inside run_buffered() go to that thread's buffer so
+    each test's output stays in one block; other writes pass through.
+    """
+    
+    def __init__(self, target):
+        self.target = target
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (self.target if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        self.target.flush()
+    
+    def run_buffered(self, test):
+        self._local.buffer = io.StringIO()
+        try:
+            passed = test()
+        finally:
+            output = self._local.buffer.getvalue()
+            self._local.buffer = None
+        return passed, output
+
+async def run_tests(tests):
+    """
+    Run (name, test) pairs concurrently and return [(name, passed), ...]
+    
+    ADR Note: The tests are independent and mostly wait (capture, the
+    change detector's inter-frame delay), so running them in worker threads
+    overlaps that idle time. Each test creates its own ScreenCapture, which
+    keeps mss handles per thread.
+    """
+    stdout = _PerThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(stdout.run_buffered, test) for _, test in tests)
+        )
+    finally:
+        sys.stdout = stdout.target
+    
+    results = []
+    for (name, _), (passed, output) in zip(tests, outcomes):
+        print(output, end="")
+        results.append((name, passed))
+    return results
+
 def main():
     print("Visual Analyzer Test Suite\n")
     print("=" * 50)
     
-    results = []
-    
-    results.append(("Screen Capture", test_screen_capture()))
-    results.append(("Change Detector", test_change_detector()))
-    results.append(("Visual Analyzer", test_visual_analyzer()))
+    results = asyncio.run(run_tests([
+        ("Screen Capture", test_screen_capture),
+        ("Change Detector", test_change_detector),
+        ("Visual Analyzer", test_visual_analyzer),
+    ]))
     
     print("\n" + "=" * 50)
     print("Summary:")
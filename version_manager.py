@@ -5,12 +5,25 @@ Manages versioning and automatically commits changes to GitHub
 """
 
 import os
+import re
 import sys
 import subprocess
 import json
 import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+# ADR Note: pygit2 is optional. When available, local status/stage/commit go
+# through libgit2 in-process instead of forking git for every call; otherwise
+# the subprocess path below is used unchanged.
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+# Local git config key caching origin's default branch (see _resolve_upstream)
+UPSTREAM_CONFIG_KEY = "re-orch.upstream"
 
 
 class VersionManager:
@@ -25,17 +38,35 @@ class VersionManager:
     
     def __init__(self, version_file: str = "VERSION"):
         self.version_file = Path(version_file)
+        # (st_mtime_ns, st_size) of VERSION when self.version was loaded/written
+        self._file_key: Optional[Tuple[int, int]] = None
+        # (version string, parsed parts) so bumps do not re-split the string
+        self._parsed: Optional[Tuple[str, Tuple[int, int, int]]] = None
         self.version = self._read_version()
     
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        """Identity of the VERSION file on disk, or None if it is missing"""
+        try:
+            st = self.version_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
     def _read_version(self) -> str:
         """
         Read current version from file
         
         ADR Note: Defaults to "0.1.0" if VERSION file doesn't exist. This allows
         the system to work even if the version file is missing, providing a safe
-        fallback rather than failing completely.
+        fallback rather than failing completely. The file is only re-read when
+        its mtime/size differ from what was last loaded or written, so a bump
+        followed by get_version() costs one stat instead of a read.
         """
-        if self.version_file.exists():
+        key = self._stat_key()
+        if key is not None and key == self._file_key:
+            return self.version
+        self._file_key = key
+        if key is not None:
             return self.version_file.read_text().strip()
         return "0.1.0"
     
@@ -43,30 +74,41 @@ class VersionManager:
         """Write version to file"""
         self.version_file.write_text(f"{version}\n")
         self.version = version
+        self._file_key = self._stat_key()
     
-    def bump_patch(self) -> str:
-        """Bump patch version (0.1.0 -> 0.1.1)"""
-        major, minor, patch = map(int, self.version.split('.'))
-        new_version = f"{major}.{minor}.{patch + 1}"
+    def _parts(self) -> Tuple[int, int, int]:
+        """Current (major, minor, patch), refreshed from VERSION if it changed"""
+        self.version = self._read_version()
+        if self._parsed is None or self._parsed[0] != self.version:
+            major, minor, patch = map(int, self.version.split('.'))
+            self._parsed = (self.version, (major, minor, patch))
+        return self._parsed[1]
+    
+    def _set_parts(self, major: int, minor: int, patch: int) -> str:
+        """Write a new version from its parts"""
+        new_version = f"{major}.{minor}.{patch}"
         self._write_version(new_version)
+        self._parsed = (new_version, (major, minor, patch))
         return new_version
     
+    def bump_patch(self) -> str:
+        """Bump patch version (0.1.0 -> 0.1.1)"""
+        major, minor, patch = self._parts()
+        return self._set_parts(major, minor, patch + 1)
+    
     def bump_minor(self) -> str:
         """Bump minor version (0.1.0 -> 0.2.0)"""
-        major, minor, patch = map(int, self.version.split('.'))
-        new_version = f"{major}.{minor + 1}.0"
-        self._write_version(new_version)
-        return new_version
+        major, minor, patch = self._parts()
+        return self._set_parts(major, minor + 1, 0)
     
     def bump_major(self) -> str:
         """Bump major version (0.1.0 -> 1.0.0)"""
-        major, minor, patch = map(int, self.version.split('.'))
-        new_version = f"{major + 1}.0.0"
-        self._write_version(new_version)
-        return new_version
+        major, minor, patch = self._parts()
+        return self._set_parts(major + 1, 0, 0)
     
     def get_version(self) -> str:
-        """Get current version"""
+        """Get current version (re-read only if VERSION changed on disk)"""
+        self.version = self._read_version()
         return self.version
 
 
@@ -78,11 +120,44 @@ class GitAutomation:
     (like GitPython) to minimize dependencies and ensure compatibility with
     any git installation. The subprocess approach also provides better error
     handling and visibility into git operations.
+    
+    ADR Note: If pygit2 is installed and repo_path is a repository, status and
+    commit use libgit2 directly, which avoids a fork+exec and a fresh index/pack
+    open per call when --auto runs on a schedule. Push and tag operations stay
+    on subprocess: they are network-bound and rely on the user's git
+    credential setup. Commits made through libgit2 do not run git hooks.
     """
     
+    # Config overrides for local git calls: no auto-gc or fsmonitor hook per run
+    _GIT_OPTIONS = ["-c", "gc.auto=0", "-c", "core.fsmonitor=false"]
+    
+    # libgit2 status flags mapped to porcelain (index, worktree) letters
+    _INDEX_CODES = (
+        ("GIT_STATUS_INDEX_NEW", "A"),
+        ("GIT_STATUS_INDEX_MODIFIED", "M"),
+        ("GIT_STATUS_INDEX_DELETED", "D"),
+        ("GIT_STATUS_INDEX_RENAMED", "R"),
+        ("GIT_STATUS_INDEX_TYPECHANGE", "T"),
+    )
+    _WORKTREE_CODES = (
+        ("GIT_STATUS_WT_MODIFIED", "M"),
+        ("GIT_STATUS_WT_DELETED", "D"),
+        ("GIT_STATUS_WT_RENAMED", "R"),
+        ("GIT_STATUS_WT_TYPECHANGE", "T"),
+    )
+    
     def __init__(self, repo_path: Optional[Path] = None):
         self.repo_path = repo_path or Path.cwd()
         self.config = self._load_config()
+        self._status_cache: Optional[List[Tuple[str, str]]] = None
+        self._excluded_re = self._compile_excluded(self.config.get("excluded_paths", []))
+        self._upstream: Optional[str] = None
+        self._repo = None
+        if PYGIT2_AVAILABLE:
+            try:
+                self._repo = pygit2.Repository(str(self.repo_path))
+            except (pygit2.GitError, KeyError):
+                self._repo = None
     
     def _load_config(self) -> dict:
         """
@@ -101,42 +176,118 @@ class GitAutomation:
             "auto_push": True,
             "commit_message_template": "Auto-commit: {timestamp}",
             "min_changes_for_commit": 1,
+            "commit_hooks": False,
             "excluded_paths": [".git", "__pycache__", ".venv", "venv", "node_modules"]
         }
     
-    def has_changes(self) -> bool:
-        """Check if there are uncommitted changes"""
+    def _run_status(self) -> List[Tuple[str, str]]:
+        """
+        Run "git status --porcelain -z" once and return (status, path) entries
+        
+        ADR Note: has_changes() and get_changed_files() are called back-to-back
+        in the --auto path, so the parsed status is memoized until a commit
+        invalidates it. The -z form keeps paths unquoted and NUL-separated, which
+        avoids the quoting and whitespace pitfalls of splitting text lines. For
+        renames and copies the entry is followed by the original path, which is
+        skipped. A failed git call is not cached. Output is read as bytes and
+        each path decoded as UTF-8 (git's encoding for -z paths) instead of
+        text=True's locale decode of the whole buffer, which garbles non-ASCII
+        names on Windows code pages; surrogateescape keeps undecodable names
+        intact.
+        """
+        if self._status_cache is not None:
+            return self._status_cache
+        
+        if self._repo is not None:
+            try:
+                status = self._repo.status(untracked_files="normal")
+            except pygit2.GitError:
+                return []
+            self._status_cache = [
+                (self._status_code(flags), filepath)
+                for filepath, flags in status.items()
+            ]
+            return self._status_cache
+        
         try:
             result = subprocess.run(
-                ["git", "status", "--porcelain"],
+                ["git", *self._GIT_OPTIONS, "status", "--porcelain", "-z"],
                 cwd=self.repo_path,
                 capture_output=True,
-                text=True,
                 check=True
             )
-            return bool(result.stdout.strip())
         except subprocess.CalledProcessError:
-            return False
+            return []
+        
+        entries = []
+        add = entries.append
+        fields = iter(result.stdout.split(b'\0'))
+        for field in fields:
+            if not field:
+                continue
+            if field[:1] in (b"R", b"C"):
+                next(fields, None)
+            add((field[:2].decode("ascii"), field[3:].decode("utf-8", "surrogateescape")))
+        self._status_cache = entries
+        return entries
+    
+    @classmethod
+    def _status_code(cls, flags: int) -> str:
+        """Translate libgit2 status flags to a two-letter porcelain code"""
+        if flags & pygit2.GIT_STATUS_WT_NEW:
+            return "??"
+        index_code = next(
+            (code for name, code in cls._INDEX_CODES if flags & getattr(pygit2, name)), " "
+        )
+        worktree_code = next(
+            (code for name, code in cls._WORKTREE_CODES if flags & getattr(pygit2, name)), " "
+        )
+        return index_code + worktree_code
+    
+    def _commit_with_pygit2(self, message: str):
+        """
+        Stage everything and commit through libgit2
+        
+        ADR Note: Index.add_all() adds new and modified files but leaves entries
+        for files deleted from the working tree, so those are removed first to
+        match "git add -A". The parent list is empty on an unborn branch.
+        """
+        index = self._repo.index
+        for status, filepath in self._run_status():
+            if status[1] == "D":
+                index.remove(filepath)
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+        
+        signature = self._repo.default_signature
+        parents = [] if self._repo.head_is_unborn else [self._repo.head.target]
+        self._repo.create_commit("HEAD", signature, signature, message, tree, parents)
+    
+    @staticmethod
+    def _compile_excluded(excluded_paths: List[str]) -> Optional[re.Pattern]:
+        """
+        Compile excluded_paths into one substring-matching regex
+        
+        ADR Note: One alternation of escaped literals scans each path once
+        instead of running a separate substring search per excluded entry.
+        Returns None when nothing is excluded.
+        """
+        if not excluded_paths:
+            return None
+        return re.compile("|".join(map(re.escape, excluded_paths)))
+    
+    def has_changes(self) -> bool:
+        """Check if there are uncommitted changes"""
+        return bool(self._run_status())
     
     def get_changed_files(self) -> list:
         """Get list of changed files"""
-        try:
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            files = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    status, filepath = line.split(maxsplit=1)
-                    if not any(excluded in filepath for excluded in self.config.get("excluded_paths", [])):
-                        files.append(filepath)
-            return files
-        except subprocess.CalledProcessError:
-            return []
+        entries = self._run_status()
+        if self._excluded_re is None:
+            return [filepath for _, filepath in entries]
+        search = self._excluded_re.search
+        return [filepath for _, filepath in entries if not search(filepath)]
     
     def commit_changes(self, message: Optional[str] = None) -> bool:
         """
@@ -147,6 +298,13 @@ class GitAutomation:
         message uses a template with timestamp by default, but can be overridden
         for version bumps or manual commits. Errors are caught and logged rather
         than crashing, allowing the automation to continue even if one commit fails.
+        
+        ADR Note: The commit skips git hooks (--no-verify), matching the pygit2
+        path, unless "commit_hooks" is true in automation_config.json; then the
+        git CLI is used even when pygit2 is available, since libgit2 has no
+        hooks. Auto-gc and fsmonitor are disabled for these calls; a scheduled
+        run should not pay for housekeeping on every commit. Only stderr is
+        piped (for error reporting); stdout goes to DEVNULL.
         """
         if not self.has_changes():
             return False
@@ -156,42 +314,128 @@ class GitAutomation:
             template = self.config.get("commit_message_template", "Auto-commit: {timestamp}")
             message = template.format(timestamp=timestamp)
         
+        if self._repo is not None and not self.config.get("commit_hooks", False):
+            try:
+                self._commit_with_pygit2(message)
+                self._status_cache = None
+                return True
+            except (pygit2.GitError, KeyError) as e:
+                print(f"Error committing changes: {e}", file=sys.stderr)
+                return False
+        
         try:
             # Stage all changes
             subprocess.run(
-                ["git", "add", "-A"],
+                ["git", *self._GIT_OPTIONS, "add", "-A"],
                 cwd=self.repo_path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             
             # Commit
+            verify = [] if self.config.get("commit_hooks", False) else ["--no-verify"]
             subprocess.run(
-                ["git", "commit", "-m", message],
+                ["git", *self._GIT_OPTIONS, "commit", *verify, "--quiet", "-m", message],
                 cwd=self.repo_path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
+            self._status_cache = None
             return True
         except subprocess.CalledProcessError as e:
             print(f"Error committing changes: {e}", file=sys.stderr)
             return False
     
+    def _resolve_upstream(self) -> str:
+        """
+        Branch that push_changes() pushes to on origin
+        
+        ADR Note: Taken from "upstream_branch" in automation_config.json when
+        set. Otherwise origin's default branch is read once with
+        "git symbolic-ref refs/remotes/origin/HEAD" and cached in the local
+        git config under UPSTREAM_CONFIG_KEY, so later runs skip the lookup.
+        The cache lives in .git/config rather than the tracked config file,
+        so resolving it never dirties the worktree. If origin/HEAD is not set
+        (e.g. a remote added without cloning), "master" is used and nothing
+        is cached.
+        """
+        if self._upstream is not None:
+            return self._upstream
+        
+        branch = self.config.get("upstream_branch") or self._read_git_config(UPSTREAM_CONFIG_KEY)
+        if not branch:
+            try:
+                result = subprocess.run(
+                    ["git", "symbolic-ref", "--short", "refs/remotes/origin/HEAD"],
+                    cwd=self.repo_path,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                branch = result.stdout.strip()
+                if branch.startswith("origin/"):
+                    branch = branch[len("origin/"):]
+            except subprocess.CalledProcessError:
+                branch = ""
+            if branch:
+                self._write_git_config(UPSTREAM_CONFIG_KEY, branch)
+            else:
+                branch = "master"
+        
+        self._upstream = branch
+        return branch
+    
+    def _read_git_config(self, key: str) -> Optional[str]:
+        """Read a key from the repository's git config (pygit2 when available)"""
+        if self._repo is not None:
+            try:
+                return self._repo.config[key]
+            except KeyError:
+                return None
+        result = subprocess.run(
+            ["git", "config", "--local", "--get", key],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip() or None
+    
+    def _write_git_config(self, key: str, value: str):
+        """Write a key to the repository's local git config (.git/config)"""
+        if self._repo is not None:
+            try:
+                self._repo.config[key] = value
+            except pygit2.GitError as e:
+                print(f"Error saving {key} to git config: {e}", file=sys.stderr)
+            return
+        try:
+            subprocess.run(
+                ["git", "config", "--local", key, value],
+                cwd=self.repo_path,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"Error saving {key} to git config: {e}", file=sys.stderr)
+    
     def push_changes(self) -> bool:
         """
         Push changes to remote
         
-        ADR Note: Hardcoded to push to "origin master" branch. This assumes the
-        default branch name. In the future, this could be made configurable or
-        auto-detected using "git symbolic-ref refs/remotes/origin/HEAD" to support
-        repositories using "main" or other branch names.
+        ADR Note: Pushes to origin's default branch as resolved by
+        _resolve_upstream(), so repositories using "main" work without
+        configuration.
         """
         try:
             subprocess.run(
-                ["git", "push", "origin", "master"],
+                ["git", "push", "--quiet", "origin", self._resolve_upstream()],
                 cwd=self.repo_path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError as e:
@@ -209,7 +453,8 @@ class GitAutomation:
                 ["git", "tag", "-a", tag_name, "-m", message],
                 cwd=self.repo_path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError:
@@ -219,10 +464,11 @@ class GitAutomation:
         """Push tags to remote"""
         try:
             subprocess.run(
-                ["git", "push", "origin", "--tags"],
+                ["git", "push", "--quiet", "origin", "--tags"],
                 cwd=self.repo_path,
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError as e: